@@ -80,30 +80,52 @@ readonly SCRIPT_PID=$$
 # LOGGING FUNCTIONS
 # ============================================================================
 
+# Colored level prefixes, built once instead of on every log call
+declare -rA _LOG_PREFIX=(
+  [INFO]="${GREEN}[INFO]${NC} "
+  [WARN]="${YELLOW}[WARN]${NC} "
+  [ERROR]="${RED}[ERROR]${NC} "
+  [STEP]="${BLUE}[STEP]${NC} "
+  [DEBUG]="${MAGENTA}[DEBUG]${NC} "
+  [OK]="${GREEN}[OK]${NC} "
+)
+
+# Print one log line (level $2, message $3) to fd $1 and append it to each
+# remaining file argument. Builtins only, so a log call never forks tee.
+_log_emit() {
+  local fd="$1" line f
+  printf -v line '%s%b' "${_LOG_PREFIX[$2]}" "$3"
+  shift 3
+  printf '%s\n' "$line" >&"$fd"
+  for f in "$@"; do
+    { printf '%s\n' "$line" >> "$f"; } 2>/dev/null
+  done
+}
+
 log_info() { 
-  echo -e "${GREEN}[INFO]${NC} $*" | tee -a "$LOG_FILE"
+  _log_emit 1 INFO "$*" "$LOG_FILE"
 }
 
 log_warn() { 
-  echo -e "${YELLOW}[WARN]${NC} $*" | tee -a "$LOG_FILE" "$ERROR_LOG" >&2
+  _log_emit 2 WARN "$*" "$LOG_FILE" "$ERROR_LOG"
 }
 
 log_error() { 
-  echo -e "${RED}[ERROR]${NC} $*" | tee -a "$LOG_FILE" "$ERROR_LOG" >&2
+  _log_emit 2 ERROR "$*" "$LOG_FILE" "$ERROR_LOG"
 }
 
 log_step() { 
-  echo -e "${BLUE}[STEP]${NC} $*" | tee -a "$LOG_FILE"
+  _log_emit 1 STEP "$*" "$LOG_FILE"
 }
 
 log_debug() {
   if [[ "${DEBUG:-0}" -eq 1 ]]; then
-    echo -e "${MAGENTA}[DEBUG]${NC} $*" | tee -a "$LOG_FILE"
+    _log_emit 1 DEBUG "$*" "$LOG_FILE"
   fi
 }
 
 log_success() {
-  echo -e "${GREEN}[OK]${NC} $*" | tee -a "$LOG_FILE"
+  _log_emit 1 OK "$*" "$LOG_FILE"
 }
 
 # JVM workaround: disable Perf shared memory to avoid SIGBUS crashes in some JDK builds
@@ -730,8 +752,10 @@ debug_auto_fix() {
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# Emit the ANSI clear/home sequence directly; forking clear(1) on every menu
+# redraw buys nothing since the UI already relies on ANSI colors.
 clear_screen() {
-  clear 2>/dev/null || printf '\033[2J\033[H'
+  printf '\033[2J\033[H'
 }
 
 pause() {
@@ -739,6 +763,83 @@ pause() {
   read -p "Press Enter to continue..." -r
 }
 
+# Memoized `command -v` lookups (each miss walks every PATH entry).
+# Call reset_command_cache after installing packages so new binaries are seen.
+declare -A _CMD_CACHE=()
+
+have_cmd() {
+  local cmd="$1"
+  [[ -n "$cmd" ]] || return 1
+  if [[ -z "${_CMD_CACHE[$cmd]+x}" ]]; then
+    if command -v "$cmd" &>/dev/null; then
+      _CMD_CACHE[$cmd]=1
+    else
+      _CMD_CACHE[$cmd]=0
+    fi
+  fi
+  [[ "${_CMD_CACHE[$cmd]}" -eq 1 ]]
+}
+
+reset_command_cache() {
+  _CMD_CACHE=()
+  hash -r
+}
+
+# Check whether the Ollama API port accepts connections.
+# Uses bash's /dev/tcp redirection so no curl/ss process is spawned per poll.
+is_ollama_running() {
+  local host="${1:-127.0.0.1}"
+  local port="${2:-11434}"
+  if { exec 3<>"/dev/tcp/${host}/${port}"; } 2>/dev/null; then
+    exec 3<&- 3>&-
+    return 0
+  fi
+  return 1
+}
+
+# Short-lived cache of `ollama list` output so menu redraws don't respawn it.
+# Call ollama_list_cached in the current shell (not inside $(...)) and read
+# $OLLAMA_LIST_CACHE; call ollama_list_invalidate after pulling/removing models.
+OLLAMA_LIST_TTL=${OLLAMA_LIST_TTL:-5}
+OLLAMA_LIST_CACHE=""
+OLLAMA_LIST_CACHED_AT=-1
+
+ollama_list_cached() {
+  if (( OLLAMA_LIST_CACHED_AT < 0 || SECONDS - OLLAMA_LIST_CACHED_AT >= OLLAMA_LIST_TTL )); then
+    # With the default local server, a closed API port means `ollama list`
+    # can only fail; skip spawning it.
+    if [[ -z "${OLLAMA_HOST:-}" ]] && ! is_ollama_running; then
+      OLLAMA_LIST_CACHE=""
+      OLLAMA_LIST_CACHED_AT=-1
+      return 1
+    fi
+    if ! OLLAMA_LIST_CACHE=$(ollama list 2>/dev/null); then
+      OLLAMA_LIST_CACHE=""
+      OLLAMA_LIST_CACHED_AT=-1
+      return 1
+    fi
+    OLLAMA_LIST_CACHED_AT=$SECONDS
+  fi
+  return 0
+}
+
+ollama_list_invalidate() {
+  OLLAMA_LIST_CACHED_AT=-1
+}
+
+# True if model $1 (name or name:tag; bare names match :latest) is already
+# installed, according to the cached `ollama list` output.
+ollama_has_model() {
+  local want="$1" name _rest
+  [[ "$want" == *:* ]] || want="${want}:latest"
+  ollama_list_cached || return 1
+  # the global IFS is newline/tab only; the columns of `ollama list` are space-padded
+  while IFS=$' \t' read -r name _rest; do
+    [[ "$name" == "$want" ]] && return 0
+  done <<< "$OLLAMA_LIST_CACHE"
+  return 1
+}
+
 show_banner() {
   clear_screen
   cat << "EOF"
@@ -764,13 +865,13 @@ EOF
 open_browser() {
   local url="$1"
   
-  if command -v xdg-open &>/dev/null; then
+  if have_cmd xdg-open; then
     xdg-open "$url" &>/dev/null &
-  elif command -v open &>/dev/null; then
+  elif have_cmd open; then
     open "$url" &>/dev/null &
-  elif command -v firefox &>/dev/null; then
+  elif have_cmd firefox; then
     firefox "$url" &>/dev/null &
-  elif command -v google-chrome &>/dev/null; then
+  elif have_cmd google-chrome; then
     google-chrome "$url" &>/dev/null &
   else
     log_warn "Could not auto-open browser. Please open manually: $url"
@@ -788,7 +889,7 @@ open_browser() {
 
 detect_container_runtime() {
   # Check for Podman first (preferred - supports rootless mode natively)
-  if command -v podman &>/dev/null; then
+  if have_cmd podman; then
     CONTAINER_CMD="podman"
     log_info "Using Podman as container runtime (rootless capable)"
     
@@ -822,7 +923,7 @@ detect_container_runtime() {
     fi
     
   # Fall back to Docker if Podman not available
-  elif command -v docker &>/dev/null; then
+  elif have_cmd docker; then
     CONTAINER_CMD="docker"
     log_info "Using Docker as container runtime (Podman recommended for rootless)"
   else
@@ -967,7 +1068,8 @@ detect_os() {
     . /etc/os-release
     OS="${ID}"
     OS_VERSION="${VERSION_ID:-unknown}"
-  elif [[ "$(uname)" == "Darwin" ]]; then
+  elif [[ "${OSTYPE:-}" == darwin* ]]; then
+    # $OSTYPE is set by bash itself, so no uname fork is needed
     OS="macos"
     OS_VERSION="$(sw_vers -productVersion)"
   else
@@ -1114,56 +1216,25 @@ EOFPY
   chmod +x "${PROJECT_ROOT}/scripts/hf_search.py"
   log_success "Created hf_search.py (wrapper to scripts/python/hf_model_search.py)"
   
-  # URL Crawler Script
+  # URL Crawler wrapper (calls the python/url_crawler.py CLI)
   cat > "${PROJECT_ROOT}/scripts/url_crawler.py" << 'EOFPY'
 #!/usr/bin/env python3
-"""Crawl URLs for training data"""
+import os
 import sys
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import argparse
-
-def crawl_url(url, depth=3, visited=None):
-    if visited is None:
-        visited = set()
-    
-    if depth == 0 or url in visited:
-        return
-    
-    visited.add(url)
-    print(f"Crawling: {url}")
-    
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract text
-        text = soup.get_text(separator='\n', strip=True)
-        filename = f"training_data_{len(visited)}.txt"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"  Saved to: {filename}")
-        
-        # Find links
-        for link in soup.find_all('a', href=True):
-            next_url = urljoin(url, link['href'])
-            if urlparse(next_url).netloc == urlparse(url).netloc:
-                crawl_url(next_url, depth-1, visited)
-    except Exception as e:
-        print(f"  Error: {e}", file=sys.stderr)
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("url", help="URL to crawl")
-    parser.add_argument("--depth", type=int, default=3)
-    args = parser.parse_args()
-    crawl_url(args.url, args.depth)
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TARGET = os.path.join(HERE, 'python', 'url_crawler.py')
+if not os.path.exists(TARGET):
+    print(f"Missing helper: {TARGET}", file=sys.stderr)
+    sys.exit(1)
+
+cmd = [sys.executable, TARGET] + sys.argv[1:]
+sys.exit(subprocess.call(cmd))
 EOFPY
-  
+
   chmod +x "${PROJECT_ROOT}/scripts/url_crawler.py"
-  log_success "Created url_crawler.py"
+  log_success "Created url_crawler.py (wrapper to scripts/python/url_crawler.py)"
   
   # Monitor script generation removed — monitoring is inlined in the
   # `monitor_batch_download()` function and platform-specific scripts.
@@ -1179,7 +1250,7 @@ initialize_project() {
   create_utility_scripts
   
   # Setup rootless Podman if available
-  if command -v podman &>/dev/null; then
+  if have_cmd podman; then
     echo
     log_step "Setting up rootless Podman..."
     setup_rootless_podman
@@ -1198,7 +1269,7 @@ initialize_project() {
 
 check_command() {
   local cmd="$1"
-  if command -v "$cmd" &>/dev/null; then
+  if have_cmd "$cmd"; then
     log_success "$cmd installed"
     return 0
   else
@@ -1207,6 +1278,9 @@ check_command() {
   fi
 }
 
+# Usage: install_system_dependencies [command...]
+# Without arguments installs the full default set; otherwise only the named
+# commands, all in a single package-manager invocation.
 install_system_dependencies() {
   log_step "Installing system dependencies..."
   
@@ -1214,26 +1288,73 @@ install_system_dependencies() {
   case "$PACKAGE_MANAGER" in
     dnf|yum)
       deps=(git curl jq python3 python3-pip wget tar gzip make gcc gcc-c++ ShellCheck)
-      sudo "$PACKAGE_MANAGER" install -y "${deps[@]}"
       ;;
     apt)
       deps=(git curl jq python3 python3-pip wget tar gzip make gcc g++ shellcheck)
-      sudo apt update
-      sudo apt install -y "${deps[@]}"
       ;;
     brew)
       deps=(git curl jq python3 wget shellcheck)
-      brew install "${deps[@]}"
       ;;
     *)
       log_error "Unsupported package manager: $PACKAGE_MANAGER"
       return 1
       ;;
   esac
+
+  if [[ $# -gt 0 ]]; then
+    deps=()
+    local cmd
+    for cmd in "$@"; do
+      case "${cmd}:${PACKAGE_MANAGER}" in
+        shellcheck:dnf|shellcheck:yum) deps+=(ShellCheck) ;;
+        *) deps+=("$cmd") ;;
+      esac
+    done
+  fi
+
+  case "$PACKAGE_MANAGER" in
+    dnf|yum)
+      sudo "$PACKAGE_MANAGER" install -y "${deps[@]}"
+      ;;
+    apt)
+      sudo apt update
+      sudo apt install -y "${deps[@]}"
+      ;;
+    brew)
+      brew install "${deps[@]}"
+      ;;
+  esac
   
+  reset_command_cache
   log_success "System dependencies installed"
 }
 
+# Print the requirements.txt lines whose module cannot be found.
+# One python3 process resolves every entry with importlib.util.find_spec,
+# so nothing is actually imported.
+missing_python_requirements() {
+  local req_file="${1:-${PROJECT_ROOT}/requirements.txt}"
+  [[ -f "$req_file" ]] || return 1
+  python3 - "$req_file" <<'PYTHON'
+import importlib.util
+import re
+import sys
+
+# distribution name -> import name, where they differ
+IMPORT_NAMES = {"beautifulsoup4": "bs4", "huggingface-hub": "huggingface_hub", "pyyaml": "yaml"}
+
+with open(sys.argv[1], encoding="utf-8") as f:
+    for line in f:
+        req = line.strip()
+        if not req or req.startswith("#"):
+            continue
+        name = re.split(r"[<>=!~\[;\s]", req, maxsplit=1)[0].lower()
+        module = IMPORT_NAMES.get(name, name.replace("-", "_"))
+        if importlib.util.find_spec(module) is None:
+            print(req)
+PYTHON
+}
+
 install_python_packages() {
   log_step "Installing Python packages..."
   
@@ -1242,8 +1363,24 @@ install_python_packages() {
     return 1
   fi
   
-  python3 -m pip install --user --upgrade pip
-  python3 -m pip install --user -r "${PROJECT_ROOT}/requirements.txt"
+  # Install only what is missing, in a single pip run (concurrent pip
+  # processes would race on the same site-packages directory)
+  local missing_list
+  if missing_list=$(missing_python_requirements); then
+    if [[ -z "$missing_list" ]]; then
+      log_success "Python packages already installed"
+      return 0
+    fi
+    local missing_reqs=()
+    mapfile -t missing_reqs <<< "$missing_list"
+    python3 -m pip install --user --upgrade pip
+    python3 -m pip install --user "${missing_reqs[@]}"
+  else
+    python3 -m pip install --user --upgrade pip
+    python3 -m pip install --user -r "${PROJECT_ROOT}/requirements.txt"
+  fi
+  # pip may have added console scripts (e.g. huggingface-cli)
+  reset_command_cache
   
   log_success "Python packages installed"
 }
@@ -1252,17 +1389,18 @@ install_mcp_components() {
   log_step "Ensuring MCP components are available..."
 
   # Ensure system deps (python3, pip, jq) are present via existing system installer
-  if ! command -v python3 >/dev/null 2>&1 || ! command -v jq >/dev/null 2>&1; then
+  if ! have_cmd python3 || ! have_cmd jq; then
     log_info "Some MCP system deps missing; running install_system_dependencies"
     install_system_dependencies || log_warn "install_system_dependencies failed; please install python3/pip/jq manually"
   fi
 
   # Ensure pip packages from requirements are installed (idempotent)
-  if command -v python3 >/dev/null 2>&1; then
+  if have_cmd python3; then
     python3 -m pip install --user --upgrade pip || true
     if [[ -f "${PROJECT_ROOT}/requirements.txt" ]]; then
       python3 -m pip install --user -r "${PROJECT_ROOT}/requirements.txt" || true
     fi
+    reset_command_cache
   fi
 
   # Create MCP directories
@@ -1286,7 +1424,7 @@ check_all_dependencies() {
   
   # Check critical dependencies
   for cmd in "${critical_deps[@]}"; do
-    if ! command -v "$cmd" &>/dev/null; then
+    if ! have_cmd "$cmd"; then
       log_error "CRITICAL: $cmd is not installed (required)"
       ((missing++))
     fi
@@ -1294,13 +1432,13 @@ check_all_dependencies() {
   
   # Check recommended dependencies
   for cmd in "${recommended_deps[@]}"; do
-    if ! command -v "$cmd" &>/dev/null; then
+    if ! have_cmd "$cmd"; then
       log_debug "Recommended: $cmd is not installed"
     fi
   done
   
   # Check container runtime (Podman preferred)
-  if ! command -v podman &>/dev/null && ! command -v docker &>/dev/null; then
+  if ! have_cmd podman && ! have_cmd docker; then
     log_warn "No container runtime found (Podman recommended)"
   fi
   
@@ -1308,21 +1446,15 @@ check_all_dependencies() {
   if [[ -f "${PROJECT_ROOT}/requirements.txt" ]]; then
     log_debug "Checking Python package requirements..."
     
-    while IFS= read -r line || [[ -n "$line" ]]; do
-      # Skip comments and empty lines
-      [[ "$line" =~ ^#.*$ || -z "$line" ]] && continue
-      
-      # Extract package name (before == or >= or <=)
-      local pkg_name
-      pkg_name=$(echo "$line" | sed 's/[>=<].*//' | tr -d '[:space:]')
-      
-      if [[ -n "$pkg_name" ]]; then
-        if ! python3 -c "import ${pkg_name}" 2>/dev/null; then
-          log_debug "Python package not found: $pkg_name"
-          ((python_missing++))
-        fi
-      fi
-    done < "${PROJECT_ROOT}/requirements.txt"
+    # One find_spec pass instead of a full `python3 -c "import pkg"` per line
+    local missing_list
+    if missing_list=$(missing_python_requirements) && [[ -n "$missing_list" ]]; then
+      local req
+      while IFS= read -r req; do
+        log_debug "Python package not found: $req"
+        ((python_missing++))
+      done <<< "$missing_list"
+    fi
     
     if [[ $python_missing -gt 0 ]]; then
       log_debug "$python_missing Python packages not installed"
@@ -1347,6 +1479,7 @@ check_dependencies() {
   echo
 
   local missing=0
+  local missing_pkgs=()
   local deps=(curl git python3 jq shellcheck)
   
   # Add container runtime to check
@@ -1366,6 +1499,10 @@ check_dependencies() {
       esac
     else
       ((missing++))
+      case "$cmd" in
+        podman|docker) ;;  # container runtimes are set up from the Podman wizard
+        *) missing_pkgs+=("$cmd") ;;
+      esac
     fi
   done
   
@@ -1377,7 +1514,9 @@ check_dependencies() {
     echo
     read -p "Install missing dependencies? [y/N]: " -r reply
     if [[ "$reply" =~ ^[Yy]$ ]]; then
-      install_system_dependencies
+      if [[ ${#missing_pkgs[@]} -gt 0 ]]; then
+        install_system_dependencies "${missing_pkgs[@]}"
+      fi
       install_python_packages
     fi
   fi
@@ -1394,7 +1533,7 @@ install_ollama() {
   log_step "Installing Ollama..."
   echo
   
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     log_info "Ollama is already installed"
     ollama --version
     pause
@@ -1421,7 +1560,8 @@ install_ollama() {
       ;;
   esac
   
-  if command -v ollama &>/dev/null; then
+  reset_command_cache
+  if have_cmd ollama; then
     log_success "Ollama installed successfully"
     ollama --version
   else
@@ -1436,7 +1576,7 @@ uninstall_ollama() {
   log_step "Uninstalling Ollama..."
   echo
   
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_warn "Ollama is not installed"
     pause
     return 0
@@ -1511,13 +1651,13 @@ install_aider() {
   log_step "Installing Aider (CLI + optional server)..."
   echo
 
-  if command -v aider &>/dev/null; then
+  if have_cmd aider; then
     log_info "Aider appears to be already installed: $(command -v aider)"
     pause
     return 0
   fi
 
-  if ! command -v python3 &>/dev/null; then
+  if ! have_cmd python3; then
     log_error "python3 not found; please install python3 before installing Aider"
     pause
     return 1
@@ -1535,6 +1675,7 @@ install_aider() {
     return 1
   fi
 
+  reset_command_cache
   log_info "Installed Aider. To run the Aider server: 'aider server' or see https://aider.chat/docs/install.html"
   pause
 }
@@ -1543,7 +1684,7 @@ uninstall_aider() {
   show_banner
   log_step "Uninstalling Aider..."
   echo
-  if ! command -v python3 &>/dev/null; then
+  if ! have_cmd python3; then
     log_warn "python3 not available; skipping pip uninstall"
     pause
     return 0
@@ -1557,7 +1698,7 @@ start_aider() {
   show_banner
   log_step "Starting Aider server (background)"
   echo
-  if ! command -v aider &>/dev/null; then
+  if ! have_cmd aider; then
     log_error "Aider not installed; run 'Install Aider' first"
     pause
     return 1
@@ -1569,17 +1710,18 @@ start_aider() {
     return 0
   fi
 
-  # Try common serve commands; don't fail hard if unknown flags
-  nohup bash -c "aider server --port 3000" >/dev/null 2>&1 &
+  # Try common serve commands; don't fail hard if unknown flags.
+  # aider is exec'd directly (no wrapper shell), so $! is the server itself.
+  nohup aider server --port 3000 >/dev/null 2>&1 &
   sleep 1
-  if pgrep -f "aider" >/dev/null 2>&1; then
+  if kill -0 "$!" 2>/dev/null; then
     log_success "Aider server started (background)"
     log_info "Default port: 3000 (visit http://localhost:3000 if enabled)"
   else
     # Try alternate command
-    nohup bash -c "aider serve --port 3000" >/dev/null 2>&1 &
+    nohup aider serve --port 3000 >/dev/null 2>&1 &
     sleep 1
-    if pgrep -f "aider" >/dev/null 2>&1; then
+    if kill -0 "$!" 2>/dev/null; then
       log_success "Aider server started (background)"
       log_info "Default port: 3000"
     else
@@ -1710,9 +1852,14 @@ ollama_quickstart() {
 
   # Pull a sensible default model for code assistance (ansible tasks)
   local default_model="codellama:7b-instruct"
-  if command -v ollama &>/dev/null; then
-    log_info "Pulling default model: $default_model"
-    ollama pull "$default_model" || log_warn "Failed to pull $default_model"
+  if have_cmd ollama; then
+    if ollama_has_model "$default_model"; then
+      log_info "Default model already installed: $default_model"
+    else
+      log_info "Pulling default model: $default_model"
+      ollama pull "$default_model" || log_warn "Failed to pull $default_model"
+      ollama_list_invalidate
+    fi
   else
     log_error "Ollama not available; cannot pull model"
     pause
@@ -1722,7 +1869,7 @@ ollama_quickstart() {
   # Clear and start Ollama with the model so user can begin immediately
   clear_screen
   log_step "Starting Ollama with model: $default_model"
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     ollama run "$default_model" || log_error "Failed to run $default_model"
   else
     log_error "Ollama not found after installation"
@@ -1769,7 +1916,7 @@ start_runner() {
   esac
   case "$choice" in
     1)
-      if command -v ollama &>/dev/null; then
+      if have_cmd ollama; then
         log_info "Starting Ollama service..."
         sudo systemctl start ollama
         sudo systemctl enable ollama
@@ -1893,7 +2040,7 @@ mcp_publish_context() {
   mcp_init
   local out_file="${PROJECT_ROOT}/mcp/contexts/${name}.json"
 
-  if command -v jq >/dev/null 2>&1; then
+  if have_cmd jq; then
     # If jq is present, wrap payload with timestamp cleanly
     jq -n --arg ts "$(date -u +%Y-%m-%dT%H:%M:%SZ)" --argjson p "${payload:-null}" '{timestamp:$ts,data:$p}' >"$out_file" 2>/dev/null || {
       # fallback if payload isn't valid JSON for jq
@@ -1929,7 +2076,7 @@ mcp_consume_runner_request() {
   if [[ ! -f "$file" ]]; then
     return 1
   fi
-  if command -v jq >/dev/null 2>&1; then
+  if have_cmd jq; then
     jq -r '.runner // empty' "$file" 2>/dev/null || true
   else
     # Fallback: crude grep
@@ -1948,7 +2095,7 @@ mcp_list_contexts() {
 mcp_publish_runner_request() {
   local runner_name="$1"
   mcp_init
-  if command -v jq >/dev/null 2>&1; then
+  if have_cmd jq; then
     jq -n --arg runner "$runner_name" --arg user "${USER:-$(whoami)}" \
       --arg host "${HOSTNAME:-$(hostname)}" --arg ts "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
       '{runner:$runner,user:$user,host:$host,timestamp:$ts}' | \
@@ -2035,9 +2182,9 @@ health_check_dashboard() {
     # Helper: check listening ports (ss preferred)
     is_port_listening() {
       local port=$1
-      if command -v ss >/dev/null 2>&1; then
+      if have_cmd ss; then
         ss -ltn '( sport = :'"$port"' )' 2>/dev/null | grep -q LISTEN && return 0 || return 1
-      elif command -v netstat >/dev/null 2>&1; then
+      elif have_cmd netstat; then
         netstat -tln 2>/dev/null | awk '{print $4}' | grep -E ":$port$" >/dev/null && return 0 || return 1
       else
         return 1
@@ -2045,10 +2192,13 @@ health_check_dashboard() {
     }
 
     # Ollama
-    if command -v ollama &>/dev/null; then
-      if systemctl is-active --quiet ollama 2>/dev/null || pgrep -f "ollama" >/dev/null 2>&1 || is_port_listening 11434; then
+    if have_cmd ollama; then
+      # Probe the API port first; only fall back to systemctl/pgrep when it is closed
+      local ollama_port_open=0
+      is_ollama_running && ollama_port_open=1
+      if [[ $ollama_port_open -eq 1 ]] || systemctl is-active --quiet ollama 2>/dev/null || pgrep -f "ollama" >/dev/null 2>&1; then
         printf "  %sOK%s Ollama: Running (port 11434)\n" "$GREEN" "$NC"
-        if is_port_listening 11434; then
+        if [[ $ollama_port_open -eq 1 ]]; then
           printf "    → http://localhost:11434\n"
         fi
       else
@@ -2059,7 +2209,7 @@ health_check_dashboard() {
     fi
     
     # Aider
-    if command -v aider &>/dev/null; then
+    if have_cmd aider; then
       printf "  %sOK%s Aider: Installed\n" "$GREEN" "$NC"
       if is_port_listening 3000; then
         printf "    → http://localhost:3000\n"
@@ -2092,9 +2242,14 @@ health_check_dashboard() {
     echo "${CYAN}[MODELS]${NC}"
     echo "─────────────────────────────────────────────────────────"
     # Models
-    if command -v ollama &>/dev/null; then
-      local model_count
-      model_count=$(ollama list 2>/dev/null | tail -n +2 | wc -l || echo 0)
+    if have_cmd ollama; then
+      local model_count=0
+      if ollama_list_cached && [[ -n "$OLLAMA_LIST_CACHE" ]]; then
+        # Count rows in-shell (minus the header) instead of piping through tail|wc
+        local model_rows=()
+        mapfile -t model_rows <<< "$OLLAMA_LIST_CACHE"
+        model_count=$(( ${#model_rows[@]} - 1 ))
+      fi
       printf "  Ollama Models: %s\n" "$model_count"
     else
       printf "  Ollama Models: 0\n"
@@ -2192,7 +2347,7 @@ check_installed_runners() {
   echo
   
   # Check Ollama
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     log_success "Ollama: Installed"
     echo "  Version: $(ollama --version 2>/dev/null || echo 'unknown')"
     echo "  Status: $(systemctl is-active ollama 2>/dev/null || echo 'inactive')"
@@ -2202,7 +2357,7 @@ check_installed_runners() {
   echo
   
   # Check Aider
-  if command -v aider &>/dev/null; then
+  if have_cmd aider; then
     log_success "Aider: Installed"
     echo "  Location: $(command -v aider 2>/dev/null || echo 'unknown')"
   else
@@ -2290,7 +2445,7 @@ interactive_model_selector() {
     *) log_error "Invalid option" && pause && return 1 ;;
   esac
   
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed. Install it first from AI Runners menu."
     pause
     return 1
@@ -2299,6 +2454,7 @@ interactive_model_selector() {
   log_info "Downloading $model_name with Ollama..."
   echo
   if ollama pull "$model_name"; then
+    ollama_list_invalidate
     log_success "Model downloaded: $model_name"
     echo
     read -p "Test the model now? [y/N]: " -r reply
@@ -2351,8 +2507,31 @@ download_model_huggingface() {
   mkdir -p "${PROJECT_ROOT}/data/models"
   
   # Use huggingface-cli to download
-  if command -v huggingface-cli &>/dev/null; then
-    huggingface-cli download "$model_id" --local-dir "${PROJECT_ROOT}/data/models/${model_id##*/}"
+  if have_cmd huggingface-cli; then
+    # GGUF repos usually hold one file per quantization; offer to fetch just one
+    # instead of every multi-GB variant in the repo
+    local -a gguf_files=() include=()
+    local i gsel
+    mapfile -t gguf_files < <(python3 - "$model_id" 2>/dev/null <<'PY'
+import sys
+from huggingface_hub import list_repo_files
+for f in list_repo_files(sys.argv[1]):
+    if f.lower().endswith(".gguf"):
+        print(f)
+PY
+)
+    if (( ${#gguf_files[@]} > 1 )); then
+      echo "GGUF files in ${model_id}:"
+      for i in "${!gguf_files[@]}"; do
+        echo "  $((i + 1))) ${gguf_files[$i]}"
+      done
+      echo "  0) All files"
+      read -p "Select file to download [0]: " -r gsel
+      if [[ "$gsel" =~ ^[0-9]+$ ]] && (( gsel >= 1 && gsel <= ${#gguf_files[@]} )); then
+        include=("${gguf_files[$((gsel - 1))]}")
+      fi
+    fi
+    huggingface-cli download "$model_id" "${include[@]}" --local-dir "${PROJECT_ROOT}/data/models/${model_id##*/}"
     log_success "Model downloaded to: ${PROJECT_ROOT}/data/models/${model_id##*/}"
   else
     log_error "huggingface-cli not found. Install with: pip install huggingface-hub"
@@ -2370,7 +2549,7 @@ install_code_assistants_bundle() {
   log_step "Install Code Assistant Bundle (Ollama)"
   echo
 
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed. Install it first from AI Runners menu."
     pause
     return 1
@@ -2383,11 +2562,10 @@ install_code_assistants_bundle() {
   )
 
   log_info "Pulling code-focused models with Ollama..."
-  for m in "${code_models[@]}"; do
-    log_info "Pulling $m"
-    ollama pull "$m" || log_warn "Failed to pull $m"
-    echo
-  done
+  pull_models_parallel "${code_models[@]}"
+  if (( ${#PULL_FAILED[@]} > 0 )); then
+    log_warn "Failed to pull: ${PULL_FAILED[*]}"
+  fi
 
   log_success "Code assistant bundle installation complete."
   echo
@@ -2404,7 +2582,7 @@ run_code_assistant() {
   log_step "Run Code Assistant (Ollama)"
   echo
 
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed. Install it first from AI Runners menu."
     pause
     return 1
@@ -2412,7 +2590,8 @@ run_code_assistant() {
 
   log_info "Discovering installed code assistant models..."
   local candidates
-  candidates=$(ollama list 2>/dev/null | awk 'NR>1 {print $1}' | grep -Ei 'code|codellama|mistral')
+  ollama_list_cached || true
+  candidates=$(awk 'NR>1 && tolower($1) ~ /code|codellama|mistral/ {print $1}' <<< "$OLLAMA_LIST_CACHE")
   if [[ -z "$candidates" ]]; then
     log_warn "No code assistant models found. Install the bundle first."
     pause
@@ -2476,10 +2655,14 @@ list_available_models() {
   fi
   
   echo
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     log_info "Ollama models:"
     echo
-    ollama list || log_warn "Could not list Ollama models"
+    if ollama_list_cached; then
+      printf '%s\n' "$OLLAMA_LIST_CACHE"
+    else
+      log_warn "Could not list Ollama models"
+    fi
   fi
   
   pause
@@ -2670,6 +2853,47 @@ setup_batch_download_helper() {
   pause
 }
 
+# Pull several Ollama models concurrently, at most PULL_CONCURRENCY at a time.
+# Each pull writes to its own log under $LOG_DIR so progress bars don't interleave.
+# Results are left in PULL_OK / PULL_FAILED.
+PULL_CONCURRENCY=${PULL_CONCURRENCY:-2}
+PULL_OK=()
+PULL_FAILED=()
+pull_models_parallel() {
+  local pids=() names=() logs=()
+  local next=0 model logf
+  PULL_OK=()
+  PULL_FAILED=()
+
+  # Wait for the oldest outstanding pull (uses the caller's arrays above)
+  _pull_collect() {
+    if wait "${pids[$next]}"; then
+      PULL_OK+=("${names[$next]}")
+      log_success "Downloaded: ${names[$next]}"
+    else
+      PULL_FAILED+=("${names[$next]}")
+      log_error "Failed: ${names[$next]} (see ${logs[$next]})"
+    fi
+    next=$((next + 1))
+  }
+
+  for model in "$@"; do
+    if (( ${#pids[@]} - next >= PULL_CONCURRENCY )); then
+      _pull_collect
+    fi
+    logf="${LOG_DIR}/pull_${model//[^A-Za-z0-9._-]/_}.log"
+    log_info "Downloading: $model (log: $logf)"
+    ollama pull "$model" >"$logf" 2>&1 &
+    pids+=("$!")
+    names+=("$model")
+    logs+=("$logf")
+  done
+  while (( next < ${#pids[@]} )); do
+    _pull_collect
+  done
+  ollama_list_invalidate
+}
+
 batch_download_models() {
   show_banner
   log_step "Batch Model Download"
@@ -2722,26 +2946,16 @@ EOF
     return 0
   fi
   
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed"
     pause
     return 1
   fi
   
-  local success=0
-  local failed=0
-  
-  for model in "${models[@]}"; do
-    log_info "Downloading: $model"
-    if ollama pull "$model"; then
-      ((success++))
-      log_success "Downloaded: $model"
-    else
-      ((failed++))
-      log_error "Failed: $model"
-    fi
-    echo
-  done
+  pull_models_parallel "${models[@]}"
+  local success=${#PULL_OK[@]}
+  local failed=${#PULL_FAILED[@]}
+  echo
   
   echo "==========================================================="
   log_info "Batch download complete: $success succeeded, $failed failed"
@@ -2752,7 +2966,7 @@ EOF
     read -p "View downloaded models? [y/N]: " -r reply
     if [[ "$reply" =~ ^[Yy]$ ]]; then
       echo
-      ollama list
+      ollama_list_cached && printf '%s\n' "$OLLAMA_LIST_CACHE"
       echo
     fi
   fi
@@ -2781,8 +2995,12 @@ monitor_batch_download() {
     echo "───────────────────────────────────────────────────────────────────"
     echo ""
     echo "Downloaded Models:"
-    if command -v ollama &>/dev/null; then
-      ollama list 2>/dev/null || echo "  (Ollama not running yet)"
+    if have_cmd ollama; then
+      if ollama_list_cached; then
+        printf '%s\n' "$OLLAMA_LIST_CACHE"
+      else
+        echo "  (Ollama not running yet)"
+      fi
     else
       echo "  (Ollama not installed yet)"
     fi
@@ -2802,14 +3020,14 @@ benchmark_model() {
   log_step "Model Performance Benchmark"
   echo
   
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed"
     pause
     return 1
   fi
   
   log_info "Available models:"
-  ollama list
+  ollama_list_cached && printf '%s\n' "$OLLAMA_LIST_CACHE"
   echo
   
   read -p "Enter model name to benchmark: " -r model_name
@@ -2871,14 +3089,14 @@ compare_models() {
   log_step "Model Comparison Tool"
   echo
   
-  if ! command -v ollama &>/dev/null; then
+  if ! have_cmd ollama; then
     log_error "Ollama is not installed"
     pause
     return 1
   fi
   
   log_info "Available models:"
-  ollama list
+  ollama_list_cached && printf '%s\n' "$OLLAMA_LIST_CACHE"
   echo
   
   read -p "Enter first model name: " -r model1
@@ -3010,34 +3228,83 @@ remove_model_files() {
   echo
   
   local models_dir="${PROJECT_ROOT}/data/models"
+  local -a models=()
+  local d
+  if [[ -d "$models_dir" ]]; then
+    # Glob skips hidden entries, including .trash.* dirs still being deleted
+    for d in "$models_dir"/*/; do
+      [[ -d "$d" ]] || continue
+      d="${d%/}"
+      models+=("${d##*/}")
+    done
+  fi
   
-  if [[ ! -d "$models_dir" ]] || [[ -z "$(ls -A "$models_dir")" ]]; then
+  if (( ${#models[@]} == 0 )); then
     log_warn "No models found"
     pause
     return 0
   fi
   
   log_info "Available models:"
-  ls -1 "$models_dir"
+  local i
+  for i in "${!models[@]}"; do
+    echo "  $((i + 1))) ${models[$i]}"
+  done
   echo
   
-  read -p "Enter model directory name to remove: " -r model_name
-  if [[ -z "$model_name" ]]; then
-    log_error "No model name provided"
+  read -p "Select models to remove (e.g. 1,3,5): " -r selection
+  if [[ -z "$selection" ]]; then
+    log_error "No model selected"
     pause
     return 1
   fi
   
-    if [[ -d "${models_dir}/${model_name}" ]]; then
-    read -p "Remove ${model_name}? [y/N]: " -r reply
-    if [[ "$reply" =~ ^[Yy]$ ]]; then
-      rm -rf "${models_dir:?}/${model_name}"
-      log_success "Model removed: $model_name"
+  local -a selected=()
+  local -A seen=()
+  # split explicitly: the global IFS is newline/tab only
+  local -a toks=()
+  local tok
+  IFS=', ' read -ra toks <<< "$selection"
+  for tok in "${toks[@]}"; do
+    [[ -n "$tok" ]] || continue
+    if ! [[ "$tok" =~ ^[0-9]+$ ]] || (( tok < 1 || tok > ${#models[@]} )); then
+      log_error "Invalid selection: $tok"
+      pause
+      return 1
+    fi
+    [[ -n "${seen[$tok]:-}" ]] && continue
+    seen[$tok]=1
+    selected+=("${models[$((tok - 1))]}")
+  done
+  if (( ${#selected[@]} == 0 )); then
+    log_error "No model selected"
+    pause
+    return 1
+  fi
+  
+  read -p "Remove ${selected[*]}? [y/N]: " -r reply
+  if [[ ! "$reply" =~ ^[Yy]$ ]]; then
+    log_info "Cancelled"
+    pause
+    return 0
+  fi
+  
+  # Rename each out of the way (one rename(2) on the same filesystem), then
+  # delete the multi-GB trees with one background rm so the menu returns at once
+  local model_name trash
+  local -a trash_dirs=()
+  for model_name in "${selected[@]}"; do
+    trash="${models_dir:?}/.trash.${model_name}.$$"
+    if mv "${models_dir:?}/${model_name}" "$trash" 2>/dev/null; then
+      trash_dirs+=("$trash")
     else
-      log_info "Cancelled"
+      rm -rf "${models_dir:?}/${model_name}"
     fi
-  else
-    log_error "Model not found: $model_name"
+    log_success "Model removed: $model_name"
+  done
+  if (( ${#trash_dirs[@]} > 0 )); then
+    nohup rm -rf "${trash_dirs[@]}" >/dev/null 2>&1 &
+    disown
   fi
   
   pause
@@ -3073,7 +3340,7 @@ crawl_training_data() {
   python3 "${PROJECT_ROOT}/scripts/url_crawler.py" "$url" --depth "$depth"
   cd "$PROJECT_ROOT" || return
   
-  log_success "Crawling complete. Files saved to: ${PROJECT_ROOT}/data/training/"
+  log_success "Crawling complete. Pages saved to: ${PROJECT_ROOT}/data/training/training_data.jsonl"
   pause
 }
 
@@ -3154,9 +3421,26 @@ combine_crawled_data() {
     return 1
   fi
 
-  log_info "Combining text files into: $out_file"
-  # Concatenate all .txt files, normalize newlines, and remove duplicate blank lines
-  awk 'BEGIN{RS=""; ORS="\n\n"} {gsub(/\r/,"",$0); print $0}' "${training_dir}"/*.txt > "$out_file" 2>/dev/null || {
+  # The crawler appends pages to training_data.jsonl; older crawls left one
+  # .txt file per page, so pick those up too (but not a previous combined output)
+  local jsonl="${training_dir}/training_data.jsonl"
+  local -a txt_files=()
+  local f
+  for f in "${training_dir}"/*.txt; do
+    [[ -f "$f" && "$f" != "$out_file" ]] && txt_files+=("$f")
+  done
+
+  log_info "Combining crawled text into: $out_file"
+  # Concatenate page texts, normalize newlines, and remove duplicate blank lines
+  {
+    if [[ -f "$jsonl" ]]; then
+      python3 -c 'import json, sys
+for line in open(sys.argv[1], encoding="utf-8"):
+    if line.strip():
+        print(json.loads(line)["text"], end="\n\n")' "$jsonl" || exit 1
+    fi
+    (( ${#txt_files[@]} == 0 )) || cat "${txt_files[@]}"
+  } | awk 'BEGIN{RS=""; ORS="\n\n"} {gsub(/\r/,"",$0); print $0}' > "$out_file" 2>/dev/null || {
     log_error "Failed to combine files"
     pause
     return 1
@@ -3268,7 +3552,8 @@ conversion_reap() {
 }
 conversion_ensure_capacity() {
   while (( ${#CONV_PIDS[@]} >= CONVERSION_CONCURRENCY )); do
-    if command -v wait >/dev/null 2>&1 && bash -c 'help wait' >/dev/null 2>&1; then
+    # wait -n needs bash 4.3+; check the running shell instead of forking one
+    if (( BASH_VERSINFO[0] > 4 || (BASH_VERSINFO[0] == 4 && BASH_VERSINFO[1] >= 3) )); then
       wait -n 2>/dev/null || true
     else
       sleep 1
@@ -3276,10 +3561,11 @@ conversion_ensure_capacity() {
     conversion_reap
   done
 }
+# Usage: conversion_enqueue command [args...]
+# The command runs directly as a background job (no bash -c reparse).
 conversion_enqueue() {
-  local cmd="$1"
   conversion_ensure_capacity
-  bash -c "$cmd" &
+  "$@" &
   CONV_PIDS+=("$!")
 }
 conversion_wait_all() {
@@ -3411,16 +3697,28 @@ llm_search_menu() {
     return 1
   }
 
+  # Parse the results once: one "repo_id<TAB>summary" line per model
+  local -a result_ids=() result_lines=()
+  local _rid _line
+  while IFS=$'\t' read -r _rid _line; do
+    result_ids+=("$_rid")
+    result_lines+=("$_line")
+  done < <(python3 - "$tmp_json" <<'PYTHON'
+import json,sys
+with open(sys.argv[1]) as f:
+    data=json.load(f)
+for d in data:
+    print(f"{d.get('repo_id')}\t{d.get('repo_id')} — downloads:{d.get('downloads',0)} likes:{d.get('likes',0)} tags:{','.join(d.get('tags') or [])}")
+PYTHON
+)
+
   # Present numbered list
   echo
   echo "Top results:"
-  python3 - <<PYTHON
-import json,sys
-data=json.load(open('$tmp_json'))
-for i,d in enumerate(data, start=1):
-    print(f"{i}) {d.get('repo_id')} — downloads:{d.get('downloads',0)} likes:{d.get('likes',0)} tags:{','.join(d.get('tags') or [])}")
-sys.exit(0)
-PYTHON
+  local i
+  for i in "${!result_lines[@]}"; do
+    echo "$((i + 1))) ${result_lines[$i]}"
+  done
 
   echo
   read -p "Select number to act on (0 to cancel): " -r sel
@@ -3436,12 +3734,7 @@ PYTHON
     return 1
   fi
 
-  total=$(python3 - <<PYTHON
-import json
-data=json.load(open('$tmp_json'))
-print(len(data))
-PYTHON
-)
+  total=${#result_ids[@]}
   if (( sel < 1 || sel > total )); then
     log_error "Selection out of range"
     rm -f "$tmp_json"
@@ -3450,12 +3743,7 @@ PYTHON
   fi
 
   # Get repo_id for selected index
-  repo_id=$(python3 - <<PYTHON
-import json,sys
-data=json.load(open('$tmp_json'))
-print(data[int(sys.argv[1]) - 1]['repo_id'])
-PYTHON
-  "$sel")
+  repo_id="${result_ids[$((sel - 1))]}"
 
   echo "Selected: $repo_id"
   echo "Actions: 1) Inspect  2) Download weights  0) Cancel"
@@ -3481,7 +3769,7 @@ PYTHON
       if [[ -z "${HUGGINGFACE_HUB_TOKEN:-}" ]]; then
         echo
         # If huggingface-cli available, offer to run interactive login
-        if command -v huggingface-cli &>/dev/null; then
+        if have_cmd huggingface-cli; then
           read -p "No Hugging Face token found. Run 'huggingface-cli login' now? [Y/n]: " -r _runlogin
           if [[ -z "$_runlogin" ]] || [[ "$_runlogin" =~ ^[Yy]$ ]]; then
             huggingface-cli login || true
@@ -3517,7 +3805,7 @@ PYTHON
       mkdir -p "$dest_dir"
       log_info "Downloading $repo_id to $dest_dir"
       # run huggingface-cli or python downloader in background and show spinner
-      if command -v huggingface-cli &>/dev/null; then
+      if have_cmd huggingface-cli; then
         (
           HUGGINGFACE_HUB_TOKEN="${HUGGINGFACE_HUB_TOKEN}" huggingface-cli download "$repo_id" --local-dir "$dest_dir"
         ) &
@@ -3532,30 +3820,16 @@ PYTHON
         fi
       else
         # Use huggingface_hub python API as fallback (background)
-        python3 - <<'PY' &
-from huggingface_hub import hf_hub_download, list_repo_files
+        python3 - "$repo_id" "$dest_dir" <<'PY' &
+from huggingface_hub import snapshot_download
 import os,sys,json
 repo=sys.argv[1]
 outdir=sys.argv[2]
 os.makedirs(outdir, exist_ok=True)
 try:
-    # try to download a common filename or fallback to listing files
-    try:
-        fname=hf_hub_download(repo_id=repo, filename='pytorch_model.bin', cache_dir=outdir)
-        print(json.dumps({'ok':True,'file':fname}))
-    except Exception:
-        files=list_repo_files(repo_id=repo)
-        downloaded=[]
-        for f in files:
-            try:
-                p=hf_hub_download(repo_id=repo, filename=f, cache_dir=outdir)
-                downloaded.append(p)
-            except Exception:
-                continue
-        if downloaded:
-            print(json.dumps({'ok':True,'files':downloaded}))
-        else:
-            print(json.dumps({'ok':False,'error':'no-files-downloaded'}))
+    # one snapshot call fetches the repo files concurrently
+    path=snapshot_download(repo_id=repo, local_dir=outdir, max_workers=8)
+    print(json.dumps({'ok':True,'path':path}))
 except Exception as e:
     print(json.dumps({'ok':False,'error':str(e)}))
     sys.exit(2)
@@ -3572,8 +3846,13 @@ PY
       fi
 
       # Offer conversion to GGUF
+      # Repos that already ship GGUF weights need no conversion; stop at the first match
+      local existing_gguf
+      existing_gguf=$(find "$dest_dir" -type f -name '*.gguf' -print -quit 2>/dev/null)
       # Multi-format conversion options
-      if [[ -f "${PROJECT_ROOT}/scripts/third_party/llama.cpp/convert_hf_to_gguf.py" ]]; then
+      if [[ -n "$existing_gguf" ]]; then
+        log_info "Repository already provides GGUF weights: ${existing_gguf}"
+      elif [[ -f "${PROJECT_ROOT}/scripts/third_party/llama.cpp/convert_hf_to_gguf.py" ]]; then
         echo
         echo "Convert downloaded model to GGUF formats:"
         echo "  1) f16"
@@ -3628,13 +3907,17 @@ view_system_logs() {
   
   if [[ -d "$LOG_DIR" ]] && [[ -n "$(ls -A "$LOG_DIR" 2>/dev/null)" ]]; then
     log_info "Recent log files:"
-    # Use find to list recent log files robustly
-    find "$LOG_DIR" -maxdepth 1 -type f -name 'ollamatrauma_*.log' -printf '%T@ %p\n' 2>/dev/null | sort -nr | cut -d' ' -f2- | head -10 | xargs -r -d '\n' ls -lht
+    # Scan the log directory once (newest first) and reuse it for the listing
+    # and for picking the latest log
+    local recent_logs=()
+    mapfile -t recent_logs < <(find "$LOG_DIR" -maxdepth 1 -type f -name 'ollamatrauma_*.log' -printf '%T@ %p\n' 2>/dev/null | sort -nr | head -10 | cut -d' ' -f2-)
+    if [[ ${#recent_logs[@]} -gt 0 ]]; then
+      ls -lht "${recent_logs[@]}"
+    fi
     echo
     read -p "View latest log? [y/N]: " -r reply
     if [[ "$reply" =~ ^[Yy]$ ]]; then
-      local latest_log
-      latest_log=$(find "$LOG_DIR" -maxdepth 1 -type f -name 'ollamatrauma_*.log' -printf '%T@ %p\n' 2>/dev/null | sort -nr | cut -d' ' -f2- | head -1)
+      local latest_log="${recent_logs[0]:-}"
       if [[ -n "$latest_log" ]]; then
         less "$latest_log"
       else
@@ -4282,7 +4565,7 @@ quick_run() {
   fi
   
   # Detect and run installed AI runner
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     log_info "Ollama detected"
     echo
     read -p "Run default model with Ollama? [y/N]: " -r reply
@@ -4295,7 +4578,7 @@ quick_run() {
   
   # Aider runtime support is manual: 'aider server' can be started by user
   
-  if command -v docker &>/dev/null; then
+  if have_cmd docker; then
     log_info "Docker detected"
     echo
     read -p "Run default container with Docker? [y/N]: " -r reply
@@ -4313,7 +4596,7 @@ quick_run() {
     fi
   fi
   
-  if command -v podman &>/dev/null; then
+  if have_cmd podman; then
     log_info "Podman detected"
     echo
     read -p "Run default container with Podman? [y/N]: " -r reply
@@ -4365,7 +4648,7 @@ setup_container_runtime() {
   case "$choice" in
     1)
       # Install/Setup Podman
-      if ! command -v podman &>/dev/null; then
+      if ! have_cmd podman; then
         log_info "Installing Podman..."
         case "$PACKAGE_MANAGER" in
           dnf|yum)
@@ -4383,6 +4666,8 @@ setup_container_runtime() {
             return 1
             ;;
         esac
+        # the have_cmd probe above cached a miss; let later checks see the new binary
+        reset_command_cache
       fi
       log_success "Podman installed"
       run_menu_action setup_rootless_podman
@@ -4391,7 +4676,7 @@ setup_container_runtime() {
       # Fix Podman User Namespaces
       log_step "Fixing Podman User Namespace Configuration..."
       echo
-      if ! command -v podman &>/dev/null; then
+      if ! have_cmd podman; then
         log_error "Podman is not installed"
         pause
         return 1
@@ -4420,7 +4705,7 @@ setup_container_runtime() {
       ;;
     3)
       # Install/Setup Docker
-      if ! command -v docker &>/dev/null; then
+      if ! have_cmd docker; then
         log_info "Installing Docker..."
         case "$PACKAGE_MANAGER" in
           dnf|yum)
@@ -4441,6 +4726,8 @@ setup_container_runtime() {
             return 1
             ;;
         esac
+        # the have_cmd probe above cached a miss; let later checks see the new binary
+        reset_command_cache
       fi
       sudo systemctl enable --now docker
       sudo usermod -aG docker "$USER"
@@ -4528,10 +4815,10 @@ chat_interface() {
   echo
 
   # Prefer Ollama, fallback to container runtimes
-  if command -v ollama &>/dev/null; then
+  if have_cmd ollama; then
     log_info "Using Ollama for chat"
     echo
-    ollama list 2>/dev/null || true
+    ollama_list_cached && printf '%s\n' "$OLLAMA_LIST_CACHE"
     if [[ "${AUTO_MODE:-0}" -eq 1 ]]; then
       model="${AUTO_MODEL:-codellama:7b-instruct}"
       if [[ "${AUTO_STREAM:-0}" -eq 1 ]]; then
@@ -4747,8 +5034,8 @@ while [[ "$#" -gt 0 ]]; do
   esac
 done
 
-# Ensure log directory exists
-mkdir -p "$LOG_DIR" 2>/dev/null || {
+# Ensure log directory exists (skip the mkdir fork when it already does)
+[[ -d "$LOG_DIR" ]] || mkdir -p "$LOG_DIR" 2>/dev/null || {
   echo "[WARN] Could not create log directory: $LOG_DIR"
   echo "[WARN] Logs will not be saved"
 }
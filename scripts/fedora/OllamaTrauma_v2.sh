@@ -219,8 +219,10 @@ debug_auto_fix() {
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# Emit the ANSI clear/home sequence directly; forking clear(1) on every menu
+# redraw buys nothing since the UI already relies on ANSI colors.
 clear_screen() {
-  clear 2>/dev/null || printf '\033[2J\033[H'
+  printf '\033[2J\033[H'
 }
 
 pause() {
@@ -1246,8 +1248,11 @@ health_check_dashboard() {
     echo "${CYAN}[MODELS]${NC}"
     echo "─────────────────────────────────────────────────────────"
     if command -v ollama &>/dev/null; then
-      local model_count
-      model_count=$(ollama list 2>/dev/null | tail -n +2 | wc -l)
+      local model_count model_rows=()
+      # Read the listing once and count rows in-shell (minus the header)
+      # instead of piping through tail|wc
+      mapfile -t model_rows < <(ollama list 2>/dev/null)
+      model_count=$(( ${#model_rows[@]} > 1 ? ${#model_rows[@]} - 1 : 0 ))
       echo "  Ollama Models: $model_count"
     fi
     
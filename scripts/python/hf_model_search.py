@@ -2,31 +2,88 @@
 """
 Interactive Hugging Face model search CLI.
 - Search by name keyword or tag keyword
-- Fetch up to `fetch_limit` matches, then query download counts and show top 10 by downloads
+- Fetch up to `fetch_limit` matches (sorted by downloads server-side), then rank and show the top 10
 - All menus use `0` to go back (or exit at top menu)
 
 Usage:
-  python3 scripts/hf_model_search.py         # interactive
-  python3 scripts/hf_model_search.py --name "gpt"   # one-shot name search
-  python3 scripts/hf_model_search.py --tag "text-generation"  # one-shot tag search
+  python3 scripts/python/hf_model_search.py         # interactive
+  python3 scripts/python/hf_model_search.py --name "gpt"   # one-shot name search
+  python3 scripts/python/hf_model_search.py --tag "text-generation"  # one-shot tag search
 
 Requires: `huggingface_hub` (already listed in requirements.txt)
 """
 
 import sys
 import argparse
-import time
+import datetime
+import heapq
 import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from types import SimpleNamespace
 
 # lazy import of huggingface_hub to avoid editor/CI import errors when the package isn't available
 api = None
 
 
+HF_ENDPOINT = os.environ.get("HF_ENDPOINT", "https://huggingface.co").rstrip("/")
+
+# pooled session for raw Hub API requests (see fetch_meta); created on first use
+_session = None
+_session_lock = threading.Lock()
+
+
+def _new_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2, max_retries=3)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_session():
+    """Return the shared keep-alive session, or None when requests is unavailable."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            try:
+                _session = _new_session()
+            except Exception:
+                return None
+            token = os.environ.get("HF_TOKEN") or os.environ.get("HUGGINGFACE_HUB_TOKEN")
+            if token:
+                _session.headers["Authorization"] = f"Bearer {token}"
+        return _session
+
+
+def _configure_pooled_backend():
+    """Share one keep-alive connection pool across all Hub requests.
+
+    Best effort: huggingface_hub versions without `configure_http_backend`
+    (or environments without requests) keep the library default.
+    """
+    try:
+        import requests  # noqa: F401
+        from huggingface_hub import configure_http_backend
+    except Exception:
+        return
+
+    configure_http_backend(backend_factory=_new_session)
+
+
 def ensure_api():
     global api
     if api is None:
         try:
             from huggingface_hub import HfApi as _HfApi
+            _configure_pooled_backend()
             api = _HfApi()
         except Exception:
             print("Error: huggingface_hub is not installed; install with: pip install huggingface_hub")
@@ -35,98 +92,323 @@ def ensure_api():
 
 FETCH_LIMIT = 80
 TOP_N = 10
+# concurrent model_info requests while ranking; small enough to stay polite to the Hub
+MAX_WORKERS = 16
+# Hub request budget: sustained requests/second and burst size
+RATE_LIMIT = 10.0
+RATE_BURST = 20
+# attempts per request when the Hub answers 429 (waiting out Retry-After between them)
+RATE_RETRIES = 3
 
 
-def get_downloads_safe(repo_id):
-    ensure_api()
+class TokenBucket:
+    """Thread-safe token bucket; acquire() only sleeps when the budget is spent.
+
+    pause_for() holds every caller until a server-requested deadline, so rate
+    limit headers throttle all worker threads at once.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self):
+        # adaptive back-off after the server answers 429 Too Many Requests
+        with self.lock:
+            self.rate = max(self.rate / 2, 0.5)
+            self.tokens = 0.0
+
+    def pause_for(self, seconds):
+        with self.lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = 0.0
+            self.updated = now
+
+
+_bucket = TokenBucket(RATE_LIMIT, RATE_BURST)
+
+
+def _header_seconds(value):
+    """Seconds to wait from a Retry-After / X-RateLimit-Reset value (delta or epoch), or None."""
     try:
-        info = api.model_info(repo_id)
-        # some versions expose .downloads, some in ._json or .to_dict(); handle defensively
-        if hasattr(info, "downloads") and info.downloads is not None:
-            return int(info.downloads)
-        d = None
+        n = float(value)
+    except (TypeError, ValueError):
+        return None
+    if n > 1e9:  # absolute epoch timestamp
+        n -= time.time()
+    return max(n, 0.0)
+
+
+def _observe_rate_headers(status, headers):
+    """Feed a Hub response's status and rate limit headers back into the shared bucket."""
+    headers = headers or {}
+    if status == 429:
+        _bucket.slow_down()
+        _bucket.pause_for(_header_seconds(headers.get("Retry-After")) or 1.0)
+        return
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is not None and remaining.strip() in ("0", "0.0"):
+        wait = _header_seconds(headers.get("X-RateLimit-Reset"))
+        if wait:
+            _bucket.pause_for(wait)
+
+
+def _throttled(call, *args, **kwargs):
+    """Run a Hub call under the shared rate limit, honouring 429 / Retry-After.
+
+    A 429 pauses every worker for the advertised delay and halves the rate;
+    the call is retried up to RATE_RETRIES times before the error propagates.
+    """
+    for attempt in range(RATE_RETRIES):
+        _bucket.acquire()
         try:
-            d = info._json.get("downloads") if hasattr(info, "_json") else None
-        except Exception:
-            d = None
-        if d is not None:
-            return int(d)
-        # fallback to 0 if not available
-        return 0
-    except Exception:
-        return 0
+            result = call(*args, **kwargs)
+        except Exception as e:
+            resp = getattr(e, "response", None)
+            status = getattr(resp, "status_code", None)
+            if status == 429:
+                _observe_rate_headers(status, getattr(resp, "headers", None))
+                if attempt + 1 < RATE_RETRIES:
+                    continue
+            raise
+        resp = result[0] if isinstance(result, tuple) else result
+        if hasattr(resp, "status_code") and hasattr(resp, "headers"):
+            _observe_rate_headers(resp.status_code, resp.headers)
+        return result
+
+
+# The get_*_safe helpers all read the same fetch_meta() record, so asking for
+# several metrics of one repo costs a single (cached) request, not one each.
+def get_downloads_safe(repo_id):
+    meta = fetch_meta(repo_id)
+    return int((meta or {}).get("downloads") or 0)
 
 
 def get_likes_safe(repo_id):
-    ensure_api()
+    meta = fetch_meta(repo_id)
+    return int((meta or {}).get("likes") or 0)
+
+
+# persistent metadata cache (see fetch_meta); --no-cache sets CACHE_ENABLED = False
+CACHE_ENABLED = True
+CACHE_TTL = 86400
+CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "hf_model_search", "meta.sqlite")
+
+_cache_db = None
+_cache_lock = threading.Lock()
+
+
+def _cache_conn():
+    global _cache_db
+    if _cache_db is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        db = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (repo_id TEXT PRIMARY KEY, json BLOB, etag TEXT, fetched_at INTEGER)")
+        _cache_db = db
+    return _cache_db
+
+
+def _cache_get(repo_id):
+    """Return (meta, etag, fetched_at) for repo_id, or None (also when caching is off)."""
+    if not CACHE_ENABLED:
+        return None
     try:
-        info = api.model_info(repo_id)
-        if hasattr(info, "likes") and info.likes is not None:
-            return int(info.likes)
-        try:
-            j = info._json if hasattr(info, "_json") else {}
-            if isinstance(j, dict) and "likes" in j:
-                return int(j.get("likes", 0) or 0)
-        except Exception:
-            pass
-        return 0
+        with _cache_lock:
+            row = _cache_conn().execute("SELECT json, etag, fetched_at FROM meta WHERE repo_id = ?", (repo_id,)).fetchone()
     except Exception:
-        return 0
+        return None
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1], row[2]
 
 
-def get_lastmodified_safe(repo_id):
-    ensure_api()
+def _cache_put(repo_id, meta, etag):
+    if not CACHE_ENABLED:
+        return
     try:
-        info = api.model_info(repo_id)
-        t = getattr(info, "lastModified", None)
-        if t:
-            # try to parse common ISO/RFC3339 formats using only the stdlib (avoid external dateutil dependency)
-            try:
-                import datetime
-
-                s = t
-                # normalize 'Z' timezone
-                if isinstance(s, str) and s.endswith("Z"):
-                    s = s.replace("Z", "+00:00")
-                # try fromisoformat first (handles many ISO/RFC3339 forms with offset)
-                try:
-                    return datetime.datetime.fromisoformat(s)
-                except Exception:
-                    pass
-                # try a few common strptime formats as fallback
-                fmts = [
-                    "%Y-%m-%dT%H:%M:%S.%f%z",
-                    "%Y-%m-%dT%H:%M:%S%z",
-                    "%Y-%m-%d %H:%M:%S%z",
-                    "%Y-%m-%dT%H:%M:%S.%f",
-                    "%Y-%m-%dT%H:%M:%S",
-                    "%Y-%m-%d %H:%M:%S",
-                ]
-                for fmt in fmts:
-                    try:
-                        return datetime.datetime.strptime(t, fmt)
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-            return None
-        return None
+        with _cache_lock:
+            db = _cache_conn()
+            db.execute(
+                "INSERT OR REPLACE INTO meta (repo_id, json, etag, fetched_at) VALUES (?, ?, ?, ?)",
+                (repo_id, json.dumps(meta), etag, int(time.time())),
+            )
+            db.commit()
     except Exception:
+        pass
+
+
+def fetch_meta(repo_id):
+    """Fetch one model's metrics, tags and file list in a single Hub request.
+
+    Uses `GET /api/models/{repo_id}` on the pooled session (falling back to
+    `api.model_info`), so the repo file names come from `siblings` instead of a
+    separate `list_repo_files` call. Responses are kept in an on-disk cache for
+    CACHE_TTL seconds and revalidated with the stored ETag after that.
+    Returns a dict, or None on failure.
+    """
+    cached = _cache_get(repo_id)
+    if cached and time.time() - cached[2] < CACHE_TTL:
+        return cached[0]
+    etag = None
+    session = _get_session()
+    try:
+        if session is not None:
+            def get():
+                headers = {"If-None-Match": cached[1]} if cached and cached[1] else {}
+                resp = session.get(f"{HF_ENDPOINT}/api/models/{repo_id}", headers=headers, timeout=15)
+                if resp.status_code == 304:
+                    return resp, None
+                resp.raise_for_status()
+                return resp, resp.json()
+
+            resp, data = _throttled(get)
+            if data is None:
+                # not modified: the cached copy is current again
+                _cache_put(repo_id, cached[0], cached[1])
+                return cached[0]
+            etag = resp.headers.get("ETag")
+            siblings = [sib.get("rfilename", "") for sib in data.get("siblings") or []]
+        else:
+            ensure_api()
+            info = _throttled(api.model_info, repo_id)
+            data = {
+                "downloads": getattr(info, "downloads", None),
+                "likes": getattr(info, "likes", None),
+                "lastModified": getattr(info, "lastModified", None) or getattr(info, "last_modified", None),
+                "tags": getattr(info, "tags", None),
+                "pipeline_tag": getattr(info, "pipeline_tag", None),
+            }
+            siblings = [getattr(sib, "rfilename", "") for sib in getattr(info, "siblings", None) or []]
+    except Exception:
+        # serve a stale entry rather than nothing when the Hub is unreachable
+        return cached[0] if cached else None
+    lastmod = data.get("lastModified")
+    meta = {
+        "downloads": data.get("downloads"),
+        "likes": data.get("likes"),
+        "lastModified": lastmod if lastmod is None or isinstance(lastmod, str) else lastmod.isoformat(),
+        "tags": list(data.get("tags") or []),
+        "pipeline_tag": data.get("pipeline_tag"),
+        "siblings": siblings,
+    }
+    _cache_put(repo_id, meta, etag)
+    return meta
+
+
+def _weight_types(files):
+    """Classify downloadable weight formats present in a repo file list."""
+    weight_types = []
+    lower = [f.lower() for f in files]
+    if any(".gguf" in f for f in lower):
+        weight_types.append("gguf")
+    if any(f.endswith(".safetensors") for f in lower):
+        weight_types.append("safetensors")
+    if any("pytorch_model" in f or f.endswith(".bin") for f in lower):
+        weight_types.append("pytorch")
+    return weight_types
+
+
+_ISO_Z_NATIVE = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(t):
+    """Return a datetime for a Hub timestamp (datetime or ISO/RFC3339 string), or None.
+
+    Memoized: repeated searches in one session see the same timestamps again.
+    """
+    if not t:
+        return None
+    if isinstance(t, datetime.datetime):
+        return t
+    # the Hub always sends RFC 3339 (e.g. 2024-06-01T12:34:56.789Z); before 3.11
+    # fromisoformat does not accept the 'Z' suffix
+    if not _ISO_Z_NATIVE and isinstance(t, str) and t.endswith("Z"):
+        t = t[:-1] + "+00:00"
+    try:
+        return datetime.datetime.fromisoformat(t)
+    except (TypeError, ValueError):
         return None
 
 
-def search_by_name(keyword, fetch_limit=FETCH_LIMIT):
+def get_lastmodified_safe(repo_id):
+    meta = fetch_meta(repo_id)
+    return _parse_timestamp(meta["lastModified"]) if meta else None
+
+
+def _list_kwargs(fetch_limit):
+    # server-side sort by downloads, and full=True so each listed model already
+    # carries downloads/likes/lastModified (no per-model model_info round trip)
+    return {"limit": fetch_limit, "sort": "downloads", "direction": -1, "full": True}
+
+
+def _list_models(search, fetch_limit):
+    """List models matching `search` as lightweight records straight from the Hub JSON.
+
+    Goes through the pooled session so no `ModelInfo` objects are built; falls
+    back to `HfApi.list_models` when requests is unavailable or the call fails.
+    """
+    session = _get_session()
+    if session is not None:
+        params = dict(_list_kwargs(fetch_limit), search=search, full="true")
+
+        def get():
+            resp = session.get(f"{HF_ENDPOINT}/api/models", params=params, timeout=30)
+            resp.raise_for_status()
+            return resp
+
+        try:
+            rows = _throttled(get).json()
+            return [
+                SimpleNamespace(
+                    modelId=row.get("modelId") or row.get("id"),
+                    downloads=row.get("downloads"),
+                    likes=row.get("likes"),
+                    lastModified=row.get("lastModified"),
+                    tags=row.get("tags") or [],
+                    pipeline_tag=row.get("pipeline_tag"),
+                    siblings=row.get("siblings"),
+                )
+                for row in rows
+            ]
+        except Exception:
+            pass
     ensure_api()
+    return api.list_models(search=search, **_list_kwargs(fetch_limit))
+
+
+def search_by_name(keyword, fetch_limit=FETCH_LIMIT):
     # huggingface_hub supports search param
-    models = api.list_models(search=keyword, limit=fetch_limit)
+    models = _list_models(keyword, fetch_limit)
     return models
 
 
 def search_by_tag(tag, fetch_limit=FETCH_LIMIT):
-    ensure_api()
     # list_models supports filter by pipeline_tag via filter argument in newer versions
     # We'll use naive search + tag filtering to be robust
-    models = api.list_models(search=tag, limit=fetch_limit)
+    models = _list_models(tag, fetch_limit)
     # filter by tag if model has pipeline_tag
     filtered = []
     for m in models:
@@ -149,16 +431,19 @@ def search_by_keyword(keyword, fetch_limit=FETCH_LIMIT):
     Uses the HF API general `search` which matches keywords in model id, name,
     tags and the model card/description when available.
     """
-    ensure_api()
-    models = api.list_models(search=keyword, limit=fetch_limit)
+    models = _list_models(keyword, fetch_limit)
     return models
 
 
-def _parse_b_from_id(repo_id):
-    # heuristic: look for patterns like '7b', '13B', '3.5b'
-    import re
+# heuristic parameter-count pattern: '7b', '13B', '3.5b'
+_SIZE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*[bB]\b")
+
 
-    m = re.search(r"(\d+(?:\.\d+)?)\s*[bB]\b", repo_id)
+def _parse_b_from_id(repo_id):
+    # every match needs a 'b'/'B'; most tags have none, so skip the regex for them
+    if "b" not in repo_id and "B" not in repo_id:
+        return None
+    m = _SIZE_RE.search(repo_id)
     if m:
         try:
             return float(m.group(1))
@@ -173,15 +458,43 @@ def rank_models(models, top_n=TOP_N, sort_mode="composite", require_weights=Fals
     sort_mode: downloads | likes | composite
     composite blends downloads, likes, recency and tag boosts.
     """
-    items = []
-    # fetch metrics for each candidate
+    candidates = []
     for m in models:
-        repo_id = getattr(m, "modelId", None) or getattr(m, "id", None) or getattr(m, "modelId", None)
-        if not repo_id:
-            continue
-        downloads = get_downloads_safe(repo_id)
-        likes = get_likes_safe(repo_id)
-        lastmod = get_lastmodified_safe(repo_id)
+        repo_id = getattr(m, "modelId", None) or getattr(m, "id", None)
+        if repo_id:
+            candidates.append((repo_id, m))
+    if not candidates:
+        return []
+
+    def listed_metrics(m):
+        # metrics already present on the listing (list_models(full=True)); None when absent
+        downloads = getattr(m, "downloads", None)
+        likes = getattr(m, "likes", None)
+        lastmod = _parse_timestamp(getattr(m, "lastModified", None) or getattr(m, "last_modified", None))
+        return downloads, likes, lastmod
+
+    def listed_files(m):
+        # full=True listings also carry the repo file list (siblings); None when absent
+        sibs = getattr(m, "siblings", None)
+        if sibs is None:
+            return None
+        return [sib.get("rfilename", "") if isinstance(sib, dict) else getattr(sib, "rfilename", "") for sib in sibs]
+
+    def make_item(idx, candidate):
+        repo_id, m = candidate
+        downloads, likes, lastmod = listed_metrics(m)
+        # only go to the network when the listing lacks a field, and then fetch
+        # all of them (plus the file list) in one request
+        meta = None
+        if downloads is None or likes is None or lastmod is None:
+            meta = fetch_meta(repo_id)
+            if meta:
+                if downloads is None:
+                    downloads = meta["downloads"]
+                if likes is None:
+                    likes = meta["likes"]
+                if lastmod is None:
+                    lastmod = _parse_timestamp(meta["lastModified"])
         tags = set()
         try:
             if getattr(m, "pipeline_tag", None):
@@ -190,145 +503,174 @@ def rank_models(models, top_n=TOP_N, sort_mode="composite", require_weights=Fals
                 tags.update(getattr(m, "tags", []))
         except Exception:
             pass
-        items.append({"repo_id": repo_id, "model": m, "downloads": downloads, "likes": likes, "lastmod": lastmod, "tags": tags})
-        time.sleep(0.1)
-
-    if not items:
-        return []
-
-    if sort_mode == "downloads":
-        items.sort(key=lambda x: x["downloads"], reverse=True)
-        return [(x["downloads"], x["repo_id"], x["model"]) for x in items[:top_n]]
+        files = listed_files(m)
+        if files is None and meta:
+            files = meta["siblings"]
+        # idx keeps the listing order as a deterministic tie-breaker
+        return {
+            "idx": idx,
+            "repo_id": repo_id,
+            "model": m,
+            "downloads": int(downloads or 0),
+            "likes": int(likes or 0),
+            "lastmod": lastmod,
+            # epoch seconds for recency scoring; naive timestamps count as unknown
+            "lastmod_ts": int(lastmod.timestamp()) if lastmod is not None and lastmod.tzinfo is not None else None,
+            "tags": tags,
+            # derived once here rather than in every scoring pass
+            "low_tags": frozenset(t.lower() for t in tags if t),
+            "owner": repo_id.split("/")[0],
+            "files": files,
+        }
+
+    def iter_items():
+        # fetch any missing metrics concurrently and yield items as they complete;
+        # those calls are network-latency bound
+        if _get_session() is None:
+            # fetch_meta falls back to HfApi; set it up once, not per worker
+            ensure_api()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            futures = [ex.submit(make_item, idx, c) for idx, c in enumerate(candidates)]
+            for f in as_completed(futures):
+                yield f.result()
+
+    if sort_mode in ("downloads", "likes"):
+        # top-N selection streams over completed fetches: O(N log K), no full list
+        metric = sort_mode
+        top = heapq.nlargest(top_n, iter_items(), key=lambda x: (x[metric], -x["idx"]))
+        return [(x[metric], x["repo_id"], x["model"]) for x in top]
+
+    items = sorted(iter_items(), key=lambda x: x["idx"])
 
     if sort_mode == "likes_among_downloads":
         # Select a window of top-download models, then pick highest liked among them.
-        items.sort(key=lambda x: x["downloads"], reverse=True)
         # Window size: at least top_n*5 or 50, bounded by available items
         window = min(len(items), max(50, top_n * 5))
-        windowed = items[:window]
-        windowed.sort(key=lambda x: x["likes"], reverse=True)
-        out = []
-        for x in windowed[:top_n]:
-            out.append((int(x.get("downloads", 0)), x["repo_id"], x["model"], x))
-        return out
-
-    if sort_mode == "likes":
-        items.sort(key=lambda x: x["likes"], reverse=True)
-        return [(x["likes"], x["repo_id"], x["model"]) for x in items[:top_n]]
-
-    # composite scoring
+        windowed = heapq.nlargest(window, items, key=lambda x: (x["downloads"], -x["idx"]))
+        # ties on likes keep download order, as a stable sort would
+        rank = {x["idx"]: pos for pos, x in enumerate(windowed)}
+        top = heapq.nlargest(top_n, windowed, key=lambda x: (x["likes"], -rank[x["idx"]]))
+        return [(int(x.get("downloads", 0)), x["repo_id"], x["model"], x) for x in top]
+
+    # composite scoring, in two stages: score every candidate from listing
+    # fields, then probe weight files only for the leading candidates
+    _pre_score(items)
+    top = _refine_top(items, top_n, require_weights=require_weights, gguf_only=gguf_only, max_b=max_b)
+    # prepare output with representative metric (composite score -> show downloads for context)
+    return [(int(x.get("downloads", 0)), x["repo_id"], x["model"], x) for x in top]
+
+
+TRUSTED_ORGS = {"TheBloke", "stabilityai", "meta", "openai", "huggingface", "EleutherAI", "bigscience", "microsoft"}
+# boost if weights present (prefer models with gguf/safetensors/pytorch for local use)
+WEIGHT_BOOSTS = {"gguf": 0.35, "safetensors": 0.2, "pytorch": 0.1}
+
+
+def _pre_score(items):
+    """Stage 1: set x["base_score"] from downloads, likes, recency, tags and owner."""
     # normalize components
     max_dl = max((x["downloads"] for x in items), default=1)
     max_likes = max((x["likes"] for x in items), default=1)
-    # recency in days: newer -> higher
-    import datetime
-
-    now = datetime.datetime.now(datetime.timezone.utc)
-    recencies = []
+    # recency in days: newer -> higher (integer math on epoch seconds)
+    now_ts = int(time.time())
     for x in items:
-        if x["lastmod"]:
-            try:
-                days = max(0, (now - x["lastmod"]).days)
-            except Exception:
-                days = 365
-        else:
-            days = 365
-        recencies.append(days)
-    max_rec = max(recencies) if recencies else 1
-
-    # probe repo files for weight types and owner metadata
-    trusted_orgs = {"TheBloke", "stabilityai", "meta", "openai", "huggingface", "EleutherAI", "bigscience", "microsoft"}
+        ts = x["lastmod_ts"]
+        x["recency_days"] = max(0, (now_ts - ts) // 86400) if ts is not None else 365
+    max_rec = max((x["recency_days"] for x in items), default=1)
+
+    # weights: downloads 0.45, likes 0.25, recency 0.15, folded into the
+    # normalization so each item costs three multiply-adds
+    dl_scale = 0.45 / max_dl if max_dl > 0 else 0.0
+    likes_scale = 0.25 / max_likes if max_likes > 0 else 0.0
+    rec_scale = 0.15 / max_rec if max_rec > 0 else 0.0
     for x in items:
-        repo = x["repo_id"]
-        weight_types = []
-        try:
-            files = api.list_repo_files(repo)
-            lower = [f.lower() for f in files]
-            if any(".gguf" in f for f in lower):
-                weight_types.append("gguf")
-            if any(f.endswith(".safetensors") for f in lower):
-                weight_types.append("safetensors")
-            if any("pytorch_model" in f or f.endswith(".bin") for f in lower):
-                weight_types.append("pytorch")
-        except Exception:
-            weight_types = []
-        x["weight_types"] = weight_types
-        try:
-            x["owner"] = repo.split("/")[0]
-        except Exception:
-            x["owner"] = ""
-
-    # apply filters: gguf_only and max_b
-    if gguf_only:
-        items = [it for it in items if it.get("weight_types") and "gguf" in it.get("weight_types")]
-
-    if max_b is not None:
-        filtered = []
-        for it in items:
-            size_b = _parse_b_from_id(it["repo_id"]) or None
-            # try tags for sizes
-            if size_b is None:
-                for t in it.get("tags", []):
-                    size_b = _parse_b_from_id(t) or size_b
-            # include if size known and <= max_b
-            if size_b is not None:
-                if size_b <= float(max_b):
-                    filtered.append(it)
-                else:
-                    continue
-            else:
-                # if unknown size, allow only if weights present (gguf/safetensors)
-                if it.get("weight_types"):
-                    filtered.append(it)
-        items = filtered
-
-    scored = []
-    for idx, x in enumerate(items):
-        dl_norm = x["downloads"] / max_dl if max_dl > 0 else 0
-        likes_norm = x["likes"] / max_likes if max_likes > 0 else 0
-        recency_days = recencies[idx]
-        rec_norm = (max_rec - recency_days) / max_rec if max_rec > 0 else 0
         tag_boost = 0
-        low_tags = {t.lower() for t in x["tags"] if t}
-        if "text-generation" in low_tags or "text-generation" in (getattr(x["model"], "pipeline_tag", "") or ""):
+        # pipeline_tag is already part of tags (see make_item)
+        if "text-generation" in x["low_tags"]:
             tag_boost += 0.2
-        if "transformers" in low_tags:
+        if "transformers" in x["low_tags"]:
             tag_boost += 0.15
-        # boost if weights present (prefer models with gguf/safetensors/pytorch for local use)
-        weight_boost = 0
-        if x.get("weight_types"):
-            if "gguf" in x["weight_types"]:
-                weight_boost += 0.35
-            if "safetensors" in x["weight_types"]:
-                weight_boost += 0.2
-            if "pytorch" in x["weight_types"]:
-                weight_boost += 0.1
-
-        owner_boost = 0
-        if x.get("owner") in trusted_orgs:
-            owner_boost = 0.25
-
-        # weights: downloads 0.45, likes 0.25, recency 0.15
-        score = dl_norm * 0.45 + likes_norm * 0.25 + rec_norm * 0.15 + tag_boost + weight_boost + owner_boost
-        scored.append((score, x["repo_id"], x["model"], x))
-
-    scored.sort(reverse=True, key=lambda x: x[0])
-    # prepare output with representative metric (composite score -> show downloads for context)
-    # optionally filter to only models that have weights
-    if require_weights:
-        scored = [s for s in scored if s[3].get("weight_types")]
-
-    out = []
-    for s, repo_id, m, meta in scored[:top_n]:
-        out.append((int(meta.get("downloads", 0)), repo_id, m, meta))
-    return out
+        owner_boost = 0.25 if x["owner"] in TRUSTED_ORGS else 0
+        x["base_score"] = (
+            x["downloads"] * dl_scale
+            + x["likes"] * likes_scale
+            + (max_rec - x["recency_days"]) * rec_scale
+            + tag_boost
+            + owner_boost
+        )
+
+
+def _probe_weight_types(items):
+    """Set x["weight_types"], fetching file lists concurrently for items that lack one."""
+    missing = [x["repo_id"] for x in items if x["files"] is None]
+    fetched = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            fetched = dict(zip(missing, ex.map(fetch_meta, missing)))
+    for x in items:
+        files = x["files"]
+        if files is None:
+            meta = fetched.get(x["repo_id"])
+            files = meta["siblings"] if meta else []
+        x["weight_types"] = _weight_types(files)
+
+
+def _passes_filters(x, require_weights=False, gguf_only=False, max_b=None):
+    if gguf_only and "gguf" not in x["weight_types"]:
+        return False
+    if require_weights and not x["weight_types"]:
+        return False
+    if max_b is not None:
+        size_b = _parse_b_from_id(x["repo_id"]) or None
+        # try tags for sizes
+        if size_b is None:
+            for t in x.get("tags", []):
+                size_b = _parse_b_from_id(t) or size_b
+        # include if size known and <= max_b; if unknown, only if weights present
+        if size_b is not None:
+            return size_b <= float(max_b)
+        return bool(x["weight_types"])
+    return True
+
+
+def _refine_top(items, top_n, require_weights=False, gguf_only=False, max_b=None):
+    """Stage 2: add weight boosts and filters, then pick the top N.
+
+    Candidates whose file list is not known yet are probed in base-score order,
+    only down to about 1.5x top_n (twice that when a filter needs weight info),
+    going deeper only while fewer than top_n candidates survive the filters.
+    """
+    ordered = sorted(items, key=lambda x: (-x["base_score"], x["idx"]))
+    step = max(int(top_n * 1.5), 1)
+    depth = step * 2 if (require_weights or gguf_only or max_b is not None) else step
+    probed = 0
+    while True:
+        _probe_weight_types(ordered[probed:depth])
+        probed = min(depth, len(ordered))
+        # deeper candidates still compete when the listing already carried their files
+        known = [x for x in ordered[probed:] if x["files"] is not None]
+        _probe_weight_types(known)
+        accepted = []
+        for x in ordered[:probed] + known:
+            x["score"] = x["base_score"] + sum(WEIGHT_BOOSTS[w] for w in x["weight_types"])
+            if _passes_filters(x, require_weights=require_weights, gguf_only=gguf_only, max_b=max_b):
+                accepted.append(x)
+        if len(accepted) >= top_n or probed >= len(ordered):
+            break
+        depth += step
+    return heapq.nlargest(top_n, accepted, key=lambda x: (x["score"], -x["idx"]))
+
+
+def _render(lines):
+    """Emit a whole frame with one write instead of a print() per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def show_top_list(scored_list):
     if not scored_list:
         print("No models found.")
         return
-    print("\nTop models:")
+    lines = ["", "Top models:"]
     for i, item in enumerate(scored_list, start=1):
         # support returned tuples with meta
         if len(item) == 4:
@@ -346,9 +688,9 @@ def show_top_list(scored_list):
         if likes is not None:
             extras.append(f"likes:{likes}")
         extras_s = f" ({'; '.join(extras)})" if extras else ""
-        print(f"{i}. {name} — downloads: {dl} — tag: {short}{extras_s}")
-
-    print("\nEnter a number to view details, or 0 to go back.")
+        lines.append(f"{i}. {name} — downloads: {dl} — tag: {short}{extras_s}")
+    lines += ["", "Enter a number to view details, or 0 to go back."]
+    _render(lines)
     while True:
         choice = input("> ").strip()
         if choice == "0":
@@ -371,21 +713,59 @@ def show_top_list(scored_list):
 
 
 def show_model_detail(repo_id, m, downloads, meta=None):
-    print("\n--- Model Detail ---")
-    print(f"ID: {repo_id}")
-    print(f"Downloads: {downloads}")
-    print(f"Type: {getattr(m, 'type', '')}")
-    print(f"Tags: {', '.join(getattr(m, 'tags', []) or [])}")
-    print(f"Pipeline tag: {getattr(m, 'pipeline_tag', '')}")
+    lines = [
+        "",
+        "--- Model Detail ---",
+        f"ID: {repo_id}",
+        f"Downloads: {downloads}",
+        f"Type: {getattr(m, 'type', '')}",
+        f"Tags: {', '.join(getattr(m, 'tags', []) or [])}",
+        f"Pipeline tag: {getattr(m, 'pipeline_tag', '')}",
+    ]
     if meta:
-        print(f"Likes: {meta.get('likes', '')}")
-        print(f"Weight types: {', '.join(meta.get('weight_types', []) or [])}")
-        print(f"Owner: {meta.get('owner', '')}")
+        lines.append(f"Likes: {meta.get('likes', '')}")
+        lines.append(f"Weight types: {', '.join(meta.get('weight_types', []) or [])}")
+        lines.append(f"Owner: {meta.get('owner', '')}")
         lm = meta.get('lastmod') or getattr(m, 'lastModified', '')
-        print(f"Last modified: {lm}")
+        lines.append(f"Last modified: {lm}")
     else:
-        print(f"Last modified: {getattr(m, 'lastModified', '')}")
-    print("--- End ---\n")
+        lines.append(f"Last modified: {getattr(m, 'lastModified', '')}")
+    lines += ["--- End ---", ""]
+    _render(lines)
+
+
+def _json_records(scored_list):
+    """Flatten ranked entries into plain dicts for --json output."""
+    out = []
+    for item in scored_list:
+        # scored entries may be (dl, repo_id, m, meta) or (dl, repo_id, m)
+        if len(item) == 4:
+            dl, repo_id, m, meta = item
+        else:
+            dl, repo_id, m = item
+            meta = {}
+        out.append({
+            "repo_id": repo_id,
+            "downloads": int(meta.get("downloads", dl or 0)),
+            "likes": int(meta.get("likes", 0) or 0),
+            "tags": list(getattr(m, "tags", []) or []),
+            "pipeline_tag": getattr(m, "pipeline_tag", ""),
+            "weight_types": meta.get("weight_types", []),
+            "owner": meta.get("owner", ""),
+            "lastmod": str(meta.get("lastmod") or getattr(m, "lastModified", "")),
+        })
+    return out
+
+
+def _write_json(records):
+    # orjson is optional; it serializes straight to bytes when installed
+    try:
+        import orjson
+    except ImportError:
+        print(json.dumps(records))
+        return
+    sys.stdout.buffer.write(orjson.dumps(records) + b"\n")
+    sys.stdout.flush()
 
 
 def interactive_menu():
@@ -434,76 +814,30 @@ if __name__ == "__main__":
     parser.add_argument("--max-b", type=float, default=None, help="Maximum model size in billions of parameters (e.g. 7 for 7B). If provided, models larger than this will be excluded unless they provide local weights).")
     parser.add_argument("--inspect", help="Inspect a specific model id for weight files and suitability")
     parser.add_argument("--json", action="store_true", help="Output top results as JSON (machine-readable)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Bypass the on-disk metadata cache ({CACHE_PATH})")
     args = parser.parse_args()
-    if args.name:
-        models = search_by_name(args.name, fetch_limit=args.limit)
+    if args.no_cache:
+        CACHE_ENABLED = False
+    if args.name or args.tag:
+        models = search_by_name(args.name, fetch_limit=args.limit) if args.name else search_by_tag(args.tag, fetch_limit=args.limit)
         scored = rank_models(models, top_n=args.top, sort_mode=args.sort, require_weights=args.require_weights, gguf_only=args.gguf_only, max_b=args.max_b)
         if args.json:
-            out = []
-            for item in scored:
-                # scored entries may be (dl, repo_id, m, meta) or (dl, repo_id, m)
-                if len(item) == 4:
-                    dl, repo_id, m, meta = item
-                else:
-                    dl, repo_id, m = item
-                    meta = {}
-                rec = {
-                    "repo_id": repo_id,
-                    "downloads": int(meta.get("downloads", dl or 0)),
-                    "likes": int(meta.get("likes", 0) or 0),
-                    "tags": list(getattr(m, "tags", []) or []),
-                    "pipeline_tag": getattr(m, "pipeline_tag", ""),
-                    "weight_types": meta.get("weight_types", []),
-                    "owner": meta.get("owner", ""),
-                    "lastmod": str(meta.get("lastmod") or getattr(m, "lastModified", "")),
-                }
-                out.append(rec)
-            print(json.dumps(out))
-        else:
-            show_top_list(scored)
-        sys.exit(0)
-    if args.tag:
-        models = search_by_tag(args.tag, fetch_limit=args.limit)
-        scored = rank_models(models, top_n=args.top, sort_mode=args.sort, require_weights=args.require_weights, gguf_only=args.gguf_only, max_b=args.max_b)
-        if args.json:
-            out = []
-            for item in scored:
-                if len(item) == 4:
-                    dl, repo_id, m, meta = item
-                else:
-                    dl, repo_id, m = item
-                    meta = {}
-                rec = {
-                    "repo_id": repo_id,
-                    "downloads": int(meta.get("downloads", dl or 0)),
-                    "likes": int(meta.get("likes", 0) or 0),
-                    "tags": list(getattr(m, "tags", []) or []),
-                    "pipeline_tag": getattr(m, "pipeline_tag", ""),
-                    "weight_types": meta.get("weight_types", []),
-                    "owner": meta.get("owner", ""),
-                    "lastmod": str(meta.get("lastmod") or getattr(m, "lastModified", "")),
-                }
-                out.append(rec)
-            print(json.dumps(out))
+            # machine-readable path for pipelines: no list rendering or prompts
+            _write_json(_json_records(scored))
         else:
             show_top_list(scored)
         sys.exit(0)
 
     if args.inspect:
         # Inspect a specific repo_id for weight files and whether it meets the provided policy
-        ensure_api()
         repo = args.inspect
         result = {"repo_id": repo, "weight_types": [], "owner": "", "size_b": None, "acceptable": False, "reasons": []}
-        try:
-            files = api.list_repo_files(repo)
-            lower = [f.lower() for f in files]
-            if any('.gguf' in f for f in lower):
-                result["weight_types"].append("gguf")
-            if any(f.endswith('.safetensors') for f in lower):
-                result["weight_types"].append("safetensors")
-            if any('pytorch_model' in f or f.endswith('.bin') for f in lower):
-                result["weight_types"].append("pytorch")
-        except Exception:
+        # the model info record already lists every repo file (siblings), so no
+        # separate list_repo_files request is needed
+        meta = fetch_meta(repo)
+        if meta is not None:
+            result["weight_types"] = _weight_types(meta["siblings"])
+        else:
             result["reasons"].append("failed_list_repo_files")
         try:
             result["owner"] = repo.split('/')[0]
@@ -3,13 +3,23 @@
 import sys
 import requests
 import argparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session; retries 429/5xx with exponential backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
 
 def search_models(query, limit=15):
     url = "https://huggingface.co/api/models"
     params = {"search": query, "limit": limit}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         models = response.json()
         
@@ -1,19 +1,43 @@
 #!/usr/bin/env python3
 """
 Simple MCP helper: publish/read/list JSON contexts under mcp/contexts.
-Designed to be minimal and dependency-free (stdlib only).
+Designed to be minimal and dependency-free (stdlib only); uses orjson for
+faster (de)serialization when it happens to be installed.
 """
 import json
 import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 MCP_DIR = PROJECT_ROOT / "mcp"
 CONTEXTS_DIR = MCP_DIR / "contexts"
 REQUESTS_DIR = MCP_DIR / "requests"
 
 
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. ints wider than 64 bits; the stdlib encoder handles those.
+            # Note orjson writes NaN/Infinity as null where the stdlib wrote NaN.
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def ensure_dirs():
     CONTEXTS_DIR.mkdir(parents=True, exist_ok=True)
     REQUESTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -22,8 +46,18 @@ def ensure_dirs():
 def publish_context(name: str, data: dict):
     ensure_dirs()
     path = CONTEXTS_DIR / f"{name}.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # write to a per-process temp file and rename over the target, so readers
+    # and concurrent publishers never see a half-written context
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     return str(path)
 
 
@@ -31,13 +65,21 @@ def read_context(name: str):
     path = CONTEXTS_DIR / f"{name}.json"
     if not path.exists():
         raise FileNotFoundError(f"Context not found: {name}")
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _loads(path.read_bytes())
+
+
+# last directory scan, reused while CONTEXTS_DIR's mtime is unchanged
+_list_cache = {"dir": None, "mtime": None, "names": []}
 
 
 def list_contexts():
     ensure_dirs()
-    return [p.stem for p in CONTEXTS_DIR.glob("*.json")]
+    mtime = CONTEXTS_DIR.stat().st_mtime_ns
+    if _list_cache["dir"] == CONTEXTS_DIR and _list_cache["mtime"] == mtime:
+        return list(_list_cache["names"])
+    names = [p.stem for p in CONTEXTS_DIR.glob("*.json")]
+    _list_cache.update(dir=CONTEXTS_DIR, mtime=mtime, names=names)
+    return list(names)
 
 
 if __name__ == "__main__":
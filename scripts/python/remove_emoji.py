@@ -6,107 +6,165 @@ Creates backups under ./emoji_backups/<relative-path>.
 Safety: skips binary files and common large/binary extensions.
 """
 
+import mmap
 import os
 import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(os.getcwd())
 BACKUP_DIR = ROOT / "emoji_backups"
 SKIP_DIRS = {".git", "emoji_backups", "__pycache__", "node_modules"}
+# decided by name alone, before the file is opened; model weights are the big win
 BINARY_EXTS = {
     ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".zip", ".tar", ".gz", ".so",
     ".dll", ".exe", ".class", ".pyc", ".bin", ".pb", ".pt", ".gguf",
+    ".safetensors", ".onnx", ".pth", ".ckpt", ".npy", ".npz", ".h5",
+    ".ico", ".webp", ".pdf", ".woff", ".woff2", ".ttf", ".otf",
+    ".bz2", ".xz", ".zst", ".7z", ".tgz", ".whl", ".jar", ".o", ".a",
+    ".db", ".sqlite", ".mp3", ".mp4", ".wav",
 }
 
 # Emoji ranges (covers common emoji blocks and variation selector)
-emoji_pattern = re.compile(
-    "["
-    "\U0001F300-\U0001F5FF"  # symbols & pictographs
-    "\U0001F600-\U0001F64F"  # emoticons
-    "\U0001F680-\U0001F6FF"  # transport & map
-    "\U0001F700-\U0001F77F"  # alchemical
-    "\U0001F900-\U0001F9FF"  # supplemental symbols and pictographs
-    "\U0001FA70-\U0001FAFF"  # symbols and pictographs extended-A
-    "\U00002600-\U000026FF"  # misc symbols
-    "\U00002700-\U000027BF"  # dingbats
-    "\U0001F1E6-\U0001F1FF"  # regional indicator symbols (flags)
-    "]",
-    flags=re.UNICODE,
+EMOJI_RANGES = (
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F680, 0x1F6FF),  # transport & map
+    (0x1F700, 0x1F77F),  # alchemical
+    (0x1F900, 0x1F9FF),  # supplemental symbols and pictographs
+    (0x1FA70, 0x1FAFF),  # symbols and pictographs extended-A
+    (0x2600, 0x26FF),  # misc symbols
+    (0x2700, 0x27BF),  # dingbats
+    (0x1F1E6, 0x1F1FF),  # regional indicator symbols (flags)
 )
 variation_selector = "\uFE0F"
 
-changed_files = []
-files_scanned = 0
-emoji_instances_removed = 0
+# every emoji is a single code point, so one character class covers them all;
+# sre matches a class with a C-level bitmap/range test, which beats a
+# per-character dict lookup in str.translate several times over
+emoji_class = re.compile(
+    "[" + "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in EMOJI_RANGES) + variation_selector + "]"
+)
+# the same code points as a set, for a C-level "any emoji at all?" probe
+EMOJI_CHARS = frozenset(
+    [chr(cp) for lo, hi in EMOJI_RANGES for cp in range(lo, hi + 1)] + [variation_selector]
+)
 
+# per-file work is I/O bound, so oversubscribe the CPUs to overlap syscalls
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def is_text_file(path: Path) -> bool:
-    try:
-        with open(path, "rb") as f:
-            chunk = f.read(8192)
-            if b"\0" in chunk:
-                return False
-        return True
-    except Exception:
-        return False
-
-
-for dirpath, dirnames, filenames in os.walk(ROOT):
-    # skip backup dir and other skip dirs
-    rel = os.path.relpath(dirpath, ROOT)
-    if rel == ".":
-        rel = ""
-    parts = set(rel.split(os.sep)) if rel else set()
-    if parts & SKIP_DIRS:
-        # prune traversal
-        dirnames[:] = []
-        continue
-
-    for fname in filenames:
-        fpath = Path(dirpath) / fname
-        # skip backup dir path if hit
-        if BACKUP_DIR in fpath.parents:
-            continue
-        if fpath.suffix.lower() in BINARY_EXTS:
-            continue
-        if not is_text_file(fpath):
-            continue
 
-        files_scanned += 1
+ASCII_CHUNK = 64 * 1024
+# binary sniff window: one page, so classifying touches a single mapped page
+SNIFF_BYTES = 4096
+
+
+def read_text_if_non_ascii(path):
+    """Map the file once and classify it without decoding where possible.
+
+    Returns None for binary (a NUL in the first page) or unreadable files, ""
+    for pure-ASCII text (which cannot contain emoji), and the decoded text
+    otherwise.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return ""
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\0", 0, SNIFF_BYTES) != -1:
+                return None
+            if all(mm[i:i + ASCII_CHUNK].isascii() for i in range(0, size, ASCII_CHUNK)):
+                return ""
+            return mm[:].decode("utf-8", errors="replace")
+    except (OSError, ValueError):
+        return None
+    finally:
+        os.close(fd)
+
+
+def iter_files(root):
+    """Yield candidate file paths under root, pruning SKIP_DIRS before descending.
+
+    Uses os.scandir so the directory entry's cached type info answers the
+    is-dir/is-file questions without an extra stat per file.
+    """
+    stack = [root]
+    while stack:
         try:
-            text = fpath.read_text(encoding="utf-8")
-        except Exception:
-            # try with replacement to avoid crashes
-            try:
-                text = fpath.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                continue
-
-        # count occurrences
-        found = emoji_pattern.findall(text)
-        num_found = len(found)
-        num_vs = text.count(variation_selector)
-        if num_found == 0 and num_vs == 0:
+            it = os.scandir(stack.pop())
+        except OSError:
             continue
-
-        # backup original
-        backup_path = BACKUP_DIR / fpath.relative_to(ROOT)
-        backup_path.parent.mkdir(parents=True, exist_ok=True)
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() not in BINARY_EXTS:
+                        yield entry.path
+                except OSError:
+                    continue
+
+
+def process_file(path):
+    """Strip emoji from one file. Returns (scanned, changed_relpath_or_None, removed)."""
+    fpath = Path(path)
+    text = read_text_if_non_ascii(path)
+    if text is None:
+        return 0, None, 0
+    # most non-ASCII text (accents, CJK, ...) has no emoji: skip the rewrite then
+    if EMOJI_CHARS.isdisjoint(text):
+        return 1, None, 0
+    # remove emojis and variation selectors in one pass, counting as we go
+    new_text, removed = emoji_class.subn("", text)
+    if removed == 0:
+        return 1, None, 0
+
+    # back up by moving the original aside (a metadata-only rename that keeps
+    # its timestamps), then write the cleaned text in its place
+    backup_path = BACKUP_DIR / fpath.relative_to(ROOT)
+    backup_path.parent.mkdir(parents=True, exist_ok=True)
+    mode = os.stat(fpath).st_mode
+    moved = False
+    if not os.path.islink(fpath):
+        try:
+            os.replace(fpath, backup_path)
+            moved = True
+        except OSError:
+            pass
+    if not moved:
+        # symlinks (rewrite through the link) or backups on another filesystem
         shutil.copy2(fpath, backup_path)
 
-        # remove emojis and variation selectors
-        new_text = emoji_pattern.sub("", text)
-        if variation_selector in new_text:
-            new_text = new_text.replace(variation_selector, "")
+    try:
+        fpath.write_text(new_text, encoding="utf-8")
+        if moved:
+            os.chmod(fpath, mode & 0o7777)
+    except Exception as e:
+        print(f"Failed to write {fpath}: {e}")
+        if moved and not fpath.exists():
+            os.replace(backup_path, fpath)
+        return 1, None, 0
+    return 1, str(fpath.relative_to(ROOT)), removed
 
-        try:
-            fpath.write_text(new_text, encoding="utf-8")
-            changed_files.append(str(fpath.relative_to(ROOT)))
-            emoji_instances_removed += num_found + num_vs
-        except Exception as e:
-            print(f"Failed to write {fpath}: {e}")
+
+changed_files = []
+files_scanned = 0
+emoji_instances_removed = 0
+
+# results are aggregated here on the main thread, so the workers share no state
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    for scanned, changed, removed in executor.map(process_file, iter_files(str(ROOT))):
+        files_scanned += scanned
+        emoji_instances_removed += removed
+        if changed:
+            changed_files.append(changed)
 
 # summary
 print("Emoji removal run complete.")
@@ -5,40 +5,141 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
-def crawl_url(url, depth=3, visited=None):
-    if visited is None:
-        visited = set()
-    
-    if depth == 0 or url in visited:
-        return
-    
-    visited.add(url)
-    print(f"Crawling: {url}")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree  # C parser; streams parse events to a target, no tree
+except ImportError:
+    etree = None
+
+# one keep-alive pool for the whole crawl instead of a new TCP/TLS handshake per page
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# pages fetched concurrently per BFS level; crawling is network-latency bound
+MAX_WORKERS = 16
+# crawled pages, one {"url", "text"} object per line
+DEFAULT_OUTPUT = "training_data.jsonl"
+
+class _PageCollector:
+    """lxml parser target gathering page text and <a href> values without a DOM.
+
+    Text matches BeautifulSoup's get_text(separator='\\n', strip=True): each
+    text node stripped, empty ones dropped, script/style contents skipped.
+    """
+    SKIP_TAGS = {'script', 'style', 'template'}
+
+    def __init__(self):
+        self.parts = []
+        self.hrefs = []
+        self._buf = []
+        self._skip = 0
+
+    def _flush(self):
+        if self._buf:
+            chunk = ''.join(self._buf).strip()
+            if chunk:
+                self.parts.append(chunk)
+            self._buf = []
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag == 'a' and 'href' in attrib:
+            self.hrefs.append(attrib['href'])
+
+    def end(self, tag):
+        self._flush()
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+
+    def data(self, data):
+        if not self._skip:
+            self._buf.append(data)
+
+    def close(self):
+        self._flush()
+        return '\n'.join(self.parts), self.hrefs
+
+def parse_page(content):
+    """Return (text, hrefs) for an HTML document."""
+    if etree is not None:
+        if not content.strip():
+            return '', []
+        return etree.fromstring(content, etree.HTMLParser(target=_PageCollector()))
+    soup = BeautifulSoup(content, 'html.parser')
+    return (
+        soup.get_text(separator='\n', strip=True),
+        [link['href'] for link in soup.find_all('a', href=True)],
+    )
+
+def fetch_page(url):
+    """Fetch and parse one page; return its text and same-host links."""
+    response = _SESSION.get(url, timeout=10)
+    response.raise_for_status()
+    text, hrefs = parse_page(response.content)
     
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract text
-        text = soup.get_text(separator='\n', strip=True)
-        filename = f"training_data_{len(visited)}.txt"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"  Saved to: {filename}")
-        
-        # Find links
-        for link in soup.find_all('a', href=True):
-            next_url = urljoin(url, link['href'])
-            if urlparse(next_url).netloc == urlparse(url).netloc:
-                crawl_url(next_url, depth-1, visited)
-    except Exception as e:
-        print(f"  Error: {e}", file=sys.stderr)
+    # Keep same-host links
+    base_netloc = urlparse(url).netloc
+    links = []
+    for href in hrefs:
+        next_url = urljoin(url, href)
+        if urlparse(next_url).netloc == base_netloc:
+            links.append(next_url)
+    return text, links
+
+def _record(url, text):
+    """One JSONL line for a crawled page."""
+    if orjson is not None:
+        return orjson.dumps({"url": url, "text": text}) + b"\n"
+    return (json.dumps({"url": url, "text": text}, ensure_ascii=False) + "\n").encode("utf-8")
+
+def crawl_url(url, depth=3, output=DEFAULT_OUTPUT):
+    """Breadth-first crawl: each level's pages are fetched in parallel.
+
+    Pages are appended to a single JSONL file rather than one file per page.
+    """
+    visited = {url}
+    frontier = [url]
+    saved = 0
+    with open(output, 'ab', buffering=1 << 20) as out, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        while frontier and depth > 0:
+            futures = {}
+            for page_url in frontier:
+                print(f"Crawling: {page_url}")
+                futures[executor.submit(fetch_page, page_url)] = page_url
+            next_frontier = []
+            for future in as_completed(futures):
+                try:
+                    text, links = future.result()
+                except Exception as e:
+                    print(f"  Error: {futures[future]}: {e}", file=sys.stderr)
+                    continue
+                saved += 1
+                out.write(_record(futures[future], text))
+                print(f"  Saved: {futures[future]}")
+                for next_url in links:
+                    if next_url not in visited:
+                        visited.add(next_url)
+                        next_frontier.append(next_url)
+            frontier = next_frontier
+            depth -= 1
+    print(f"Saved {saved} page(s) to: {output}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("url", help="URL to crawl")
     parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSONL file to append crawled pages to")
     args = parser.parse_args()
-    crawl_url(args.url, args.depth)
+    crawl_url(args.url, args.depth, args.output)
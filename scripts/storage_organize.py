@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Minimal storage organize helpers used by tests
@@ -27,12 +28,14 @@ def normalize_filenames(root_path, dry_run=True):
     Very small, deterministic implementation sufficient for tests.
     """
     root = Path(root_path)
-    for p in list(root.iterdir()):
-        if p.is_file():
-            new_name = p.name.replace(" ", "_")
-            # remove trailing dots and ensure name not empty
-            if new_name != p.name:
-                target = p.with_name(new_name)
-                if not dry_run:
-                    p.rename(target)
+    # scandir's entries carry the file type, so no extra stat per entry; a
+    # renamed file may be listed again but its new name has no spaces left
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_file():
+                new_name = entry.name.replace(" ", "_")
+                # remove trailing dots and ensure name not empty
+                if new_name != entry.name:
+                    if not dry_run:
+                        os.rename(entry.path, root / new_name)
     return
@@ -62,12 +62,7 @@ function Write-Log {
     $timestamp = Get-Date -Format "yyyy-MM-dd HH:mm:ss"
     $logMessage = "[$timestamp] [$Level] $Message"
     
-    # Ensure log directory exists
-    if (-not (Test-Path $Global:LogDir)) {
-        New-Item -ItemType Directory -Path $Global:LogDir -Force | Out-Null
-    }
-    
-    # Write to console
+    # Write to console (the log directory is created once at startup)
     Write-Host "[$Level] " -ForegroundColor $Color -NoNewline
     Write-Host $Message
     
@@ -471,6 +466,38 @@ function Install-Ollama {
     Pause-Script
 }
 
+function Test-OllamaPort {
+    param(
+        [string]$HostName = "127.0.0.1",
+        [int]$Port = 11434,
+        [int]$TimeoutMs = 100
+    )
+    
+    $client = New-Object System.Net.Sockets.TcpClient
+    try {
+        return $client.ConnectAsync($HostName, $Port).Wait($TimeoutMs)
+    } catch {
+        return $false
+    } finally {
+        $client.Dispose()
+    }
+}
+
+function Wait-OllamaPort {
+    param([int]$TimeoutSeconds = 30)
+    
+    $deadline = (Get-Date).AddSeconds($TimeoutSeconds)
+    $delayMs = 50
+    while ((Get-Date) -lt $deadline) {
+        if (Test-OllamaPort) {
+            return $true
+        }
+        Start-Sleep -Milliseconds $delayMs
+        $delayMs = [Math]::Min([int]($delayMs * 1.5), 1000)
+    }
+    return $false
+}
+
 function Start-Ollama {
     if (-not (Test-CommandExists "ollama")) {
         Log-Error "Ollama is not installed"
@@ -482,12 +509,12 @@ function Start-Ollama {
     
     try {
         Start-Process -FilePath "ollama" -ArgumentList "serve" -WindowStyle Hidden
-        Start-Sleep -Seconds 2
         
-        # Test if Ollama is responding
-        $response = Invoke-WebRequest -Uri "http://localhost:11434" -UseBasicParsing -ErrorAction SilentlyContinue
-        if ($response.StatusCode -eq 200) {
+        # Poll the API port with exponential backoff instead of a fixed sleep
+        if (Wait-OllamaPort -TimeoutSeconds 30) {
             Log-Success "Ollama is running on http://localhost:11434"
+        } else {
+            Log-Warn "Ollama did not open port 11434 within 30 seconds"
         }
     } catch {
         Log-Warn "Could not verify Ollama status"
@@ -608,10 +635,8 @@ if ($Help) {
     exit 0
 }
 
-# Ensure log directory exists
-if (-not (Test-Path $Global:LogDir)) {
-    New-Item -ItemType Directory -Path $Global:LogDir -Force | Out-Null
-}
+# Ensure log directory exists (once; Write-Log relies on it)
+New-Item -ItemType Directory -Path $Global:LogDir -Force | Out-Null
 
 Log-Info "Starting OllamaTrauma v2.1.0 (Windows)"
 
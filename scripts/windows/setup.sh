@@ -8,8 +8,8 @@ log_error() { echo -e "\033[0;31m[ERROR]\033[0m $*" >&2; }
 
 log_info "Setting up OllamaTrauma for Windows..."
 
-# Check if running in WSL
-if grep -qi microsoft /proc/version 2>/dev/null; then
+# Check if running in WSL (WSL sets WSL_DISTRO_NAME; fall back to the kernel string)
+if [[ -n "${WSL_DISTRO_NAME:-}" ]] || grep -qi microsoft /proc/version 2>/dev/null; then
   log_info "Detected WSL - using Ubuntu/Debian packages"
   
   sudo apt-get update
@@ -1,3 +1,4 @@
+import atexit
 import os
 import sys
 import time
@@ -5,6 +6,34 @@ import argparse
 import re
 from datetime import datetime
 
+# Prompt patterns, compiled once. pexpect compiles plain-string patterns with
+# re.DOTALL on every expect() call; pre-compiled ones are used as-is.
+MAIN_MENU_RE = re.compile(r"Main Menu", re.DOTALL)
+MAIN_PROMPT_RE = re.compile(r"Select option \[0-9\]:", re.DOTALL)
+SUBMENU_PROMPT_RE = re.compile(r"Select option \[[0-9\-]+\]:", re.DOTALL)
+MENU_OPT_RE = re.compile(r"^\s*(\d+)\s*(?:[)\-: ]|\))", re.M)
+# Responses to selecting a submenu option, after the submenu prompt itself;
+# order matters to the handler, which dispatches on the matched group name
+OPTION_RESPONSES = [
+    ("enter", r"Press Enter to continue\.\.\."),
+    ("yn", r"Run .*\? \[y/N\]:"),
+    ("main", r"Main Menu"),
+    ("select", r"Select:"),
+    ("back", r"\[?[Bb]\]?ack|Return to Main|Go Back|Exit"),
+    ("err", r"Error|Failed|Not found"),
+]
+OPTION_GROUPS = ["prompt"] + [name for name, _ in OPTION_RESPONSES]
+
+def option_alternation(prompt_pattern):
+    """One named-group alternation of the submenu prompt and OPTION_RESPONSES.
+
+    The buffer is scanned once per expect instead of once per pattern; as with
+    a pattern list, the earliest match wins and ties go to the earlier entry.
+    """
+    prompt = getattr(prompt_pattern, "pattern", prompt_pattern)
+    parts = [("prompt", prompt)] + OPTION_RESPONSES
+    return re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in parts), re.DOTALL)
+
 def ensure_pexpect():
     try:
         import pexpect  # noqa: F401
@@ -31,6 +60,9 @@ def main():
     os.makedirs(log_dir, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_path = os.path.join(log_dir, f"OllamaTrauma_{ts}.log")
+    # one buffered handle for the whole run, shared by log() and the child's Tee
+    log_fh = open(log_path, "a", encoding="utf-8", buffering=1 << 16)
+    atexit.register(log_fh.close)
 
     failures = []
 
@@ -64,8 +96,7 @@ def main():
         if color == "red":
             line = f"{ANSI_RED}{msg}{ANSI_RESET}"
         print(line)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        log_fh.write(line + "\n")
 
     if not os.path.isfile(script_path):
         log(f"ERROR: Script not found: {script_path}")
@@ -73,8 +104,7 @@ def main():
 
     # Spawn the app
     child = pexpect.spawn("bash", [script_path], encoding="utf-8", timeout=20)
-    child_log = open(log_path, "a", encoding="utf-8")
-    child.logfile = Tee(child_log)
+    child.logfile = Tee(log_fh)
 
     def expect_and_send(expect_text, send_text=None, label=None, timeout=20):
         try:
@@ -102,13 +132,13 @@ def main():
 
     # Navigate Main Menu options safely without performing destructive actions
     # Main menu prompt
-    expect_and_send(r"Main Menu", None, label="main_menu_header")
-    expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+    expect_and_send(MAIN_MENU_RE, None, label="main_menu_header")
+    expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
 
     def parse_menu_options(screen_text):
         try:
             nums = set()
-            for m in re.finditer(r"^\s*(\d+)\s*(?:[)\-: ]|\))", screen_text, flags=re.M):
+            for m in MENU_OPT_RE.finditer(screen_text):
                 try:
                     nums.add(int(m.group(1)))
                 except Exception:
@@ -123,8 +153,8 @@ def main():
         for bk in back_keys:
             child.sendline(bk)
             try:
-                expect_and_send(r"Main Menu", None, label="return_to_main")
-                expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+                expect_and_send(MAIN_MENU_RE, None, label="return_to_main")
+                expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
                 return
             except Exception:
                 # Try next key
@@ -132,17 +162,17 @@ def main():
         # Fallback: re-enter submenu then try sending first back key again
         child.sendline(str(menu_number))
         expect_and_send(submenu_header, None, label=f"{submenu_header}_header_fallback")
-        expect_and_send(r"Select option \[[0-9\-]+\]:", None, label=f"{submenu_header}_prompt_fallback")
+        expect_and_send(SUBMENU_PROMPT_RE, None, label=f"{submenu_header}_prompt_fallback")
         child.sendline(back_keys[0])
-        expect_and_send(r"Main Menu", None, label="return_to_main_fallback")
-        expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt_fallback")
+        expect_and_send(MAIN_MENU_RE, None, label="return_to_main_fallback")
+        expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt_fallback")
 
-    def reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern=r"Select option \[[0-9\-]+\]:"):
+    def reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern=SUBMENU_PROMPT_RE):
         child.sendline(str(menu_number))
         expect_and_send(submenu_header, None, label=f"{submenu_header}_header")
         expect_and_send(submenu_prompt_pattern, None, label=f"{submenu_header}_prompt")
 
-    def exercise_submenu_all(menu_number, submenu_header, back_keys=None, submenu_prompt_pattern=r"Select option \[[0-9\-]+\]:"):
+    def exercise_submenu_all(menu_number, submenu_header, back_keys=None, submenu_prompt_pattern=SUBMENU_PROMPT_RE):
         log(f"Testing menu {menu_number}: {submenu_header}")
         if back_keys is None:
             back_keys = ["0", "q", "Q"]
@@ -154,7 +184,9 @@ def main():
         ok = expect_and_send(submenu_prompt_pattern, None, label=f"{submenu_header}_prompt")
         if not ok:
             return
-        submenu_start = time.monotonic()
+        submenu_deadline = time.monotonic() + 30
+        # Compile the per-option response alternation once for the whole submenu
+        option_alt = option_alternation(submenu_prompt_pattern)
         # Parse options from the screen prior to the prompt
         options = parse_menu_options(child.before or "")
         # Avoid selecting back option if numeric and equals back_key
@@ -167,7 +199,7 @@ def main():
         options = [o for o in options if o not in numeric_back_keys]
 
         for opt in options:
-            if (time.monotonic() - submenu_start) > 30:
+            if time.monotonic() > submenu_deadline:
                 log(f"WARN: Submenu {submenu_header} exceeded 30s; returning to main", color="red")
                 return_to_main_from_submenu(menu_number, submenu_header, back_keys=back_keys)
                 return
@@ -176,22 +208,37 @@ def main():
             child.sendline(str(opt))
             # Handle common flows: nested submenu prompt, enter-to-continue, yes/no, health select, or return to main
             handled = False
-            start_opt = time.monotonic()
             max_opt_timeout = 6
             if submenu_header == "Setup & Configuration" and opt == 3:
                 # Installing dependencies can take longer; allow more time per option
                 max_opt_timeout = 20
+            opt_deadline = time.monotonic() + max_opt_timeout
             for _ in range(3):
+                # Hard stop per-option to avoid hanging indefinitely: the
+                # expect below waits at most until the option's deadline
+                remaining = opt_deadline - time.monotonic()
+                if remaining <= 0:
+                    try:
+                        for bk in back_keys:
+                            child.sendline(bk)
+                            try:
+                                child.expect(submenu_prompt_pattern, timeout=3)
+                                break
+                            except (pexpect.TIMEOUT, pexpect.EOF):
+                                continue
+                    except (pexpect.TIMEOUT, pexpect.EOF):
+                        try:
+                            expect_and_send(MAIN_MENU_RE, None, label=f"{label}_timeout_return_main")
+                            expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
+                            reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
+                        except Exception:
+                            pass
+                    handled = True
+                    log(f"WARN: Timeout exercising {label}; skipped with safe return", color="red")
+                    break
                 try:
-                    idx = child.expect([
-                        submenu_prompt_pattern,
-                        r"Press Enter to continue\.\.\.",
-                        r"Run .*\? \[y/N\]:",
-                        r"Main Menu",
-                        r"Select:",
-                        r"\[?[Bb]\]?ack|Return to Main|Go Back|Exit",
-                        r"Error|Failed|Not found",
-                    ], timeout=10)
+                    child.expect(option_alt, timeout=remaining)
+                    idx = OPTION_GROUPS.index(child.match.lastgroup)
                     if idx == 0:
                         # Back at submenu prompt
                         handled = True
@@ -227,7 +274,7 @@ def main():
                         break
                     elif idx == 3:
                         # Returned to main unexpectedly; re-enter submenu
-                        expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt_after_return")
+                        expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt_after_return")
                         reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
                         handled = True
                         break
@@ -238,8 +285,8 @@ def main():
                         try:
                             child.expect(submenu_prompt_pattern, timeout=5)
                         except (pexpect.TIMEOUT, pexpect.EOF):
-                            expect_and_send(r"Main Menu", None, label=f"{label}_return_main")
-                            expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+                            expect_and_send(MAIN_MENU_RE, None, label=f"{label}_return_main")
+                            expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
                             reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
                         handled = True
                         break
@@ -255,8 +302,8 @@ def main():
                             except (pexpect.TIMEOUT, pexpect.EOF):
                                 continue
                         if not success:
-                            expect_and_send(r"Main Menu", None, label=f"{label}_return_main")
-                            expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+                            expect_and_send(MAIN_MENU_RE, None, label=f"{label}_return_main")
+                            expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
                             reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
                         handled = True
                         break
@@ -266,8 +313,8 @@ def main():
                         try:
                             child.expect(submenu_prompt_pattern, timeout=5)
                         except (pexpect.TIMEOUT, pexpect.EOF):
-                            expect_and_send(r"Main Menu", None, label=f"{label}_return_main")
-                            expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+                            expect_and_send(MAIN_MENU_RE, None, label=f"{label}_return_main")
+                            expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
                             reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
                         handled = True
                         break
@@ -295,33 +342,13 @@ def main():
                         except (pexpect.TIMEOUT, pexpect.EOF):
                             # Re-enter submenu from main if we got bounced
                             try:
-                                child.expect(r"Main Menu", timeout=3)
-                                expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt_after_bounce")
+                                child.expect(MAIN_MENU_RE, timeout=3)
+                                expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt_after_bounce")
                                 reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
                                 handled = True
                                 break
                             except (pexpect.TIMEOUT, pexpect.EOF):
                                 pass
-                # Hard stop per-option to avoid hanging indefinitely
-                if not handled and (time.monotonic() - start_opt) > max_opt_timeout:
-                    try:
-                        for bk in back_keys:
-                            child.sendline(bk)
-                            try:
-                                child.expect(submenu_prompt_pattern, timeout=3)
-                                break
-                            except (pexpect.TIMEOUT, pexpect.EOF):
-                                continue
-                    except (pexpect.TIMEOUT, pexpect.EOF):
-                        try:
-                            expect_and_send(r"Main Menu", None, label=f"{label}_timeout_return_main")
-                            expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
-                            reenter_submenu(menu_number, submenu_header, submenu_prompt_pattern)
-                        except Exception:
-                            pass
-                    handled = True
-                    log(f"WARN: Timeout exercising {label}; skipped with safe return", color="red")
-                    break
             if not handled:
                 failures.append(label)
                 log(f"WARN: Could not fully exercise {label}", color="red")
@@ -346,8 +373,8 @@ def main():
     # Expect pause prompt
     expect_and_send(r"Press Enter to continue\.\.\.", "", label="crawler_pause")
     # Back to main menu
-    expect_and_send(r"Main Menu", None, label="return_to_main_after_crawler")
-    expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+    expect_and_send(MAIN_MENU_RE, None, label="return_to_main_after_crawler")
+    expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
 
     # 5) Maintenance & Logs
     exercise_submenu_all(5, "Maintenance & Logs")
@@ -358,15 +385,15 @@ def main():
     expect_and_send(r"Health Check Dashboard", None, label="health_header", timeout=30)
     # Exit with 'q'
     expect_and_send(r"Select:", "q", label="health_select")
-    expect_and_send(r"Main Menu", None, label="return_to_main_after_health")
-    expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+    expect_and_send(MAIN_MENU_RE, None, label="return_to_main_after_health")
+    expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
 
     # 7) Chat Interface (may be missing; ensure app handles gracefully)
     log("Testing menu 7: Chat Interface")
     child.sendline("7")
     # Expect either a prompt or an error log; just wait for main menu again
-    expect_and_send(r"Main Menu", None, label="return_to_main_after_chat")
-    expect_and_send(r"Select option \[0-9\]:", None, label="main_menu_prompt")
+    expect_and_send(MAIN_MENU_RE, None, label="return_to_main_after_chat")
+    expect_and_send(MAIN_PROMPT_RE, None, label="main_menu_prompt")
 
     # 8) Configuration Profiles
     exercise_submenu_all(8, "Configuration Profiles")
@@ -391,9 +418,9 @@ def main():
     # Attempt to return to main; tolerate EOF if quick run ends the program
     handled_main = False
     try:
-        child.expect(r"Main Menu", timeout=5)
+        child.expect(MAIN_MENU_RE, timeout=5)
         handled_main = True
-        child.expect(r"Select option \[0-9\]:", timeout=5)
+        child.expect(MAIN_PROMPT_RE, timeout=5)
     except (pexpect.TIMEOUT, pexpect.EOF):
         log("INFO: Quick Run completed without returning to Main Menu (EOF/TIMEOUT)")
 
@@ -1,10 +1,14 @@
 import importlib.util
+import os
 from pathlib import Path
-import shutil
 
+import pytest
 
-def load_mod():
-    # Prefer the repository-local helper implementation for test determinism
+
+@pytest.fixture(scope="session")
+def sorg():
+    # Prefer the repository-local helper implementation for test determinism;
+    # loaded once per session rather than re-executed for every test
     repo_root = Path(__file__).resolve().parents[1]
     spec = importlib.util.spec_from_file_location('sorg', str(repo_root / 'scripts' / 'storage_organize.py'))
     mod = importlib.util.module_from_spec(spec)
@@ -12,28 +16,26 @@ def load_mod():
     return mod
 
 
-def test_ensure_refuses_target_only(tmp_path):
-    mod = load_mod()
+def test_ensure_refuses_target_only(sorg, tmp_path):
     root = tmp_path / 'targ'
     root.mkdir()
     # create target-only marker
-    (root / mod.MARKER_TARGET_ONLY).write_text('marked')
+    (root / sorg.MARKER_TARGET_ONLY).write_text('marked')
     # call ensure_standard_folders
-    mod.ensure_standard_folders(root, dry_run=False)
+    sorg.ensure_standard_folders(root, dry_run=False)
     # standard folders should NOT be created
-    for d in mod.STANDARD_FOLDERS:
+    for d in sorg.STANDARD_FOLDERS:
         assert not (root / d).exists()
 
 
-def test_normalize_renames_spaces(tmp_path):
-    mod = load_mod()
+def test_normalize_renames_spaces(sorg, tmp_path):
     root = tmp_path / 'n'
     root.mkdir()
     f = root / 'file with spaces.txt'
     f.write_text('hi')
-    mod.normalize_filenames(root, dry_run=False)
+    sorg.normalize_filenames(root, dry_run=False)
     # original should be gone and new sanitized name present
     assert not f.exists()
-    found = list(root.iterdir())
+    found = list(os.scandir(root))
     assert len(found) == 1
     assert 'file_with_spaces' in found[0].name